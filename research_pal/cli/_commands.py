@@ -0,0 +1,262 @@
+"""
+Subcommand implementations for the ResearchPal CLI.
+
+Kept out of main.py so that `research-pal --help` and tab completion only
+construct lazy stubs; a subcommand's imports are paid when it is invoked.
+"""
+import os
+import sys
+import logging
+import functools
+from collections import namedtuple
+
+import click
+from rich.console import Console
+
+from research_pal.utils.ui_themes import display_fancy_logo, THEME_NAMES, MINIMAL_THEMES
+from research_pal.utils.config import CONFIG_PATH, load_config, save_config, DEFAULT_CONFIG
+
+logger = logging.getLogger("research_pal")
+console = Console()
+
+def check_environment():
+    """Check if environment is properly set up."""
+    # Check if required environment variables are set
+    api_keys = {
+        "GOOGLE_API_KEY": os.environ.get("GOOGLE_API_KEY"),
+        "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY")
+    }
+
+    missing_keys = [k for k, v in api_keys.items() if not v]
+
+    if missing_keys:
+        # Try to load from config; resolve what we can, then recompute the
+        # missing list in one pass (mutating it while iterating skips entries)
+        config = load_config()
+        for key in missing_keys:
+            if config.get(key.lower()):
+                os.environ[key] = config[key.lower()]
+        missing_keys = [k for k in missing_keys if not os.environ.get(k)]
+
+    # Check if we have at least one API key
+    if "GOOGLE_API_KEY" not in missing_keys:
+        return True  # We have Google API key, we're good to go
+    elif "OPENAI_API_KEY" not in missing_keys:
+        return True  # We have OpenAI API key, we're good to go
+    else:
+        console.print("[yellow]Warning: No API keys found. You need to configure at least one of these:[/yellow]")
+        console.print("[yellow]- Google API Key (for Gemini models)[/yellow]")
+        console.print("[yellow]- OpenAI API Key (for GPT models)[/yellow]")
+        console.print("[yellow]Run 'research-pal configure' to set them up.[/yellow]")
+        return False
+
+@click.command()
+@click.option('--config-path', '-c', default=CONFIG_PATH, help='Path to configuration file.')
+@click.pass_context
+def configure(ctx, config_path):
+    """Configure ResearchPal settings."""
+    # Load existing config if available (copy: load_config returns a
+    # read-only view and we mutate before saving)
+    config = dict(load_config(config_path))
+
+    # Display logo first
+    display_fancy_logo(console, theme=ctx.obj['THEME'], animated=False)
+
+    # Prompt for configuration values
+    console.print("\n[bold]ResearchPal Configuration[/bold]\n")
+
+    console.print("[bold]API Keys:[/bold]")
+    openai_api_key = click.prompt("OpenAI API Key", default=config.get("openai_api_key", ""))
+    google_api_key = click.prompt("Google AI API Key (for Gemini Flash)", default=config.get("google_api_key", ""))
+
+    console.print("\n[bold]LLM Settings:[/bold]")
+    default_model = click.prompt("Default LLM Model",
+                                default=config.get("default_model", DEFAULT_CONFIG["default_model"]),
+                                type=click.Choice(["gpt-4o-mini", "gpt-4o", "gemini-1.5-flash", "gemini-1.5-pro"]))
+
+    output_token_limit = click.prompt("Default Output Token Limit",
+                                     default=config.get("output_token_limit", 4096),
+                                     type=int)
+
+    console.print("\n[bold]Database Settings:[/bold]")
+    db_path = click.prompt("Database Path", default=config.get("db_path", DEFAULT_CONFIG["db_path"]))
+
+    console.print("\n[bold]Output Settings:[/bold]")
+    output_dir = click.prompt("Default Output Directory", default=config.get("output_dir", DEFAULT_CONFIG["output_dir"]))
+
+    console.print("\n[bold]UI Settings:[/bold]")
+    theme = click.prompt("UI Theme",
+                         default=config.get("theme", ctx.obj['THEME']),
+                         type=click.Choice(THEME_NAMES))
+
+    disable_animations = click.confirm("Disable animations?",
+                                      default=config.get("disable_animations", config.get("theme") in MINIMAL_THEMES))
+
+    # Update config
+    config.update({
+        "openai_api_key": openai_api_key,
+        "google_api_key": google_api_key,
+        "default_model": default_model,
+        "output_token_limit": output_token_limit,
+        "db_path": db_path,
+        "output_dir": output_dir,
+        "theme": theme,
+        "disable_animations": disable_animations
+    })
+
+    # Save config
+    save_config(config, config_path)
+    console.print(f"\n[green]Configuration saved to {config_path}[/green]")
+
+    # Set environment variables right away for current session
+    if openai_api_key:
+        os.environ["OPENAI_API_KEY"] = openai_api_key
+    if google_api_key:
+        os.environ["GOOGLE_API_KEY"] = google_api_key
+
+    # Ask user if they want to enter the shell
+    if click.confirm("\nDo you want to enter the interactive shell now?", default=True):
+        ctx.invoke(shell, config_path=config_path, minimal=(theme in MINIMAL_THEMES))
+
+ShellOpts = namedtuple("ShellOpts", "minimal animation theme debug")
+
+def _resolve_shell_options(config, ctx, minimal, no_animation) -> ShellOpts:
+    """Resolve the effective shell options from CLI flags, context and config."""
+    theme = ctx.obj.get('THEME', config.get("theme", "minimal"))
+
+    # Set minimal mode based on theme if not explicitly specified
+    if minimal is None:
+        minimal = theme in MINIMAL_THEMES
+
+    # Use config's animation setting if not specified in command
+    if no_animation is None:
+        no_animation = config.get("disable_animations", False)
+
+    return ShellOpts(
+        minimal=minimal,
+        animation=not no_animation,
+        theme=theme,
+        debug=ctx.obj.get('DEBUG', False)
+    )
+
+@click.command()
+@click.option('--config-path', '-c', default=CONFIG_PATH, help='Path to configuration file.')
+@click.option('--minimal/--no-minimal', default=None, help='Use minimal UI design.')
+@click.option('--no-animation/--animation', default=None, help='Disable startup animation.')
+@click.pass_context
+def shell(ctx, config_path, minimal, no_animation):
+    """Start the interactive shell."""
+    from research_pal.cli.interactive import run_interactive_shell
+
+    # Check environment setup
+    check_environment()
+
+    # Resolve all display/debug options in one pass over the config
+    opts = _resolve_shell_options(load_config(config_path), ctx, minimal, no_animation)
+
+    # Run the interactive shell
+    run_interactive_shell(
+        config_path=config_path,
+        debug=opts.debug,
+        minimal=opts.minimal,
+        theme=opts.theme,
+        animation=opts.animation
+    )
+
+@click.command()
+@click.pass_context
+def run(ctx):
+    """Default command, starts the interactive shell."""
+    ctx.invoke(shell)
+
+@functools.lru_cache(maxsize=1)
+def _pkg_version() -> str:
+    """Resolve the installed package version once per process."""
+    from importlib.metadata import version as get_version
+
+    try:
+        return get_version("research-pal")
+    except Exception:
+        return "1.0.0"  # Default if not installed as package
+
+@click.command()
+def version():
+    """Display the version information."""
+    console.print(f"[bold]ResearchPal[/bold] version [cyan]{_pkg_version()}[/cyan]")
+    console.print("Your AI-powered research paper assistant")
+
+@click.command()
+@click.argument('file_path', type=click.Path(exists=True))
+@click.option('--test-api', is_flag=True, help='Test API connectivity with minimal processing.')
+@click.pass_context
+def test(ctx, file_path, test_api):
+    """Test file processing and API connectivity."""
+    import asyncio
+
+    from research_pal.core.llm_interface import LLMInterface
+
+    # Display logo
+    display_fancy_logo(console, theme=ctx.obj['THEME'], animated=False)
+
+    if test_api:
+        console.print("[bold]Testing API Connectivity...[/bold]")
+
+        async def test_apis():
+            llm_interface = LLMInterface()
+
+            # Fire both probes concurrently; the round-trips overlap so the
+            # command finishes in one network latency instead of two
+            openai_result, google_result = await asyncio.gather(
+                llm_interface.query_openai(
+                    prompt="Say 'Hello from GPT' if you can read this.",
+                    max_tokens=20
+                ),
+                llm_interface.query_google(
+                    prompt="Say 'Hello from Gemini' if you can read this.",
+                    max_tokens=20
+                ),
+                return_exceptions=True
+            )
+
+            console.print("\n[bold]Testing OpenAI API...[/bold]")
+            if isinstance(openai_result, Exception):
+                console.print(f"[red]Failed to connect to OpenAI API: {openai_result}[/red]")
+            else:
+                console.print(f"[green]Success! Response: {openai_result}[/green]")
+
+            console.print("\n[bold]Testing Google API (Gemini)...[/bold]")
+            if isinstance(google_result, Exception):
+                console.print(f"[red]Failed to connect to Google API: {google_result}[/red]")
+            else:
+                console.print(f"[green]Success! Response: {google_result}[/green]")
+
+        asyncio.run(test_apis())
+    else:
+        # Test file processing
+        console.print(f"[bold]Testing file processing for: {file_path}[/bold]")
+
+        from research_pal.core.pdf_processor import PDFProcessor
+
+        processor = PDFProcessor()
+
+        try:
+            with console.status("[bold green]Processing file...[/bold green]"):
+                result = processor.extract_and_chunk(file_path)
+
+            console.print(f"[green]Successfully processed file![/green]")
+            console.print(f"[bold]Metadata:[/bold] {result['metadata']}")
+            console.print(f"[bold]Extracted {result['chunk_count']} chunks[/bold]")
+            console.print(f"[bold]Found {len(result.get('highlighted_text', []))} highlighted sections[/bold]")
+            console.print(f"[bold]Detected {len(result.get('figures_tables', []))} figures/tables[/bold]")
+
+            # Show sample content
+            if result['chunks']:
+                console.print("\n[bold]Sample content (first 300 chars):[/bold]")
+                console.print(result['chunks'][0][:300] + "...")
+
+        except Exception as e:
+            console.print(f"[red]Error processing file: {e}[/red]")
+
+    # Ask user if they want to enter the shell
+    if click.confirm("\nDo you want to enter the interactive shell now?", default=True):
+        ctx.invoke(shell)
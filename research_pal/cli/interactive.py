@@ -22,13 +22,17 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from research_pal.core.summarizer import PaperSummarizer
 from research_pal.core.llm_interface import LLMInterface
 from research_pal.db.chroma_manager import ChromaManager
-from research_pal.utils.ui_themes import display_fancy_logo, get_fancy_prompt, set_theme, get_theme_color
+from research_pal.utils.ui_themes import get_fancy_prompt, set_theme, get_theme_color
 from research_pal.utils.display import display_summary
 from research_pal.utils.config import load_config
 
 logger = logging.getLogger(__name__)
 console = Console()
 
+def _prompt_user(message: str) -> str:
+    """Read a line of user input from the console."""
+    return console.input(message)
+
 class InteractiveShell(cmd.Cmd):
     """Interactive shell for ResearchPal."""
     
@@ -93,6 +97,7 @@ class InteractiveShell(cmd.Cmd):
             persist_directory=self.config.get("db_path", "~/.research_pal/chroma_db")
         )
         self.llm_interface = LLMInterface(default_model=default_model)
+
         self.summarizer = PaperSummarizer(
             llm_interface=self.llm_interface,
             db_manager=self.db_manager,
@@ -931,7 +936,7 @@ class InteractiveShell(cmd.Cmd):
                             console.print("Use the --force flag to reprocess it, or 'open' to view the existing summary.")
                             
                             # Ask if the user wants to open the existing paper
-                            if console.input(f"Open existing summary? [y/N]: ").lower().strip() == "y":
+                            if _prompt_user(f"Open existing summary? [y/N]: ").lower().strip() == "y":
                                 self.do_open(paper_id)
                             return
             
@@ -1278,7 +1283,7 @@ def do_help(self, arg):
             # Handle Ctrl+C gracefully
             console.print("\n[yellow]Operation interrupted by user.[/yellow]")
             # Ask if user wants to exit
-            if console.input("Exit ResearchPal? [y/N]: ").lower().strip() == "y":
+            if _prompt_user("Exit ResearchPal? [y/N]: ").lower().strip() == "y":
                 self.do_exit("")
             else:
                 # Restart cmdloop
@@ -1381,14 +1386,22 @@ def run_interactive_shell(config_path=None, debug=False, minimal=False, theme="m
     config = load_config(config_path)
     disable_animations = config.get("disable_animations", False)
     show_animation = animation and not disable_animations
+
+    # Animation is only worth paying for in a real terminal - skip it when
+    # stdout is piped or redirected (scripted/CI runs)
+    if not sys.stdout.isatty():
+        show_animation = False
     
     # If no theme specified, use from config
     if config.get("theme") and theme == "minimal":
         theme = config.get("theme")
     
+    # Initialize the shell first so a failed startup doesn't pay for (or hide
+    # errors behind) the logo animation
+    shell = InteractiveShell(config_path, debug=debug, minimal=minimal, theme=theme)
+
     # Display animated logo with fancier animation (or simple logo for minimal theme)
+    from research_pal.utils.ui_themes import display_fancy_logo
     display_fancy_logo(console, animated=show_animation, theme=theme)
-    
-    # Initialize and run the shell
-    shell = InteractiveShell(config_path, debug=debug, minimal=minimal, theme=theme)
+
     shell.cmdloop()
\ No newline at end of file
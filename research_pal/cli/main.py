@@ -6,24 +6,21 @@ Provides a unified interface for working with research papers.
 """
 import os
 import sys
-import click
-import asyncio
+import importlib
 from typing import Optional, List, Dict, Any
 import logging
+
+import click
 from rich.console import Console
 from rich.logging import RichHandler
-import yaml
-import json
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from research_pal.core.summarizer import PaperSummarizer
-from research_pal.core.llm_interface import LLMInterface
-from research_pal.db.chroma_manager import ChromaManager
-from research_pal.cli.interactive import InteractiveShell, run_interactive_shell
-from research_pal.utils.ui_themes import display_fancy_logo, get_fancy_prompt, set_theme
-from research_pal.utils.config import CONFIG_PATH, load_config, save_config, DEFAULT_CONFIG
+# Subcommand bodies live in research_pal.cli._commands and are imported on
+# demand by LazyGroup, so `--help`, `version` and tab completion don't pay
+# for the summarizer / LLM / shell import chain.
+from research_pal.utils.ui_themes import set_theme, THEME_NAMES
 
 # Set up logging
 logging.basicConfig(
@@ -36,40 +33,35 @@ logging.basicConfig(
 logger = logging.getLogger("research_pal")
 console = Console()
 
-def check_environment():
-    """Check if environment is properly set up."""
-    # Check if required environment variables are set
-    api_keys = {
-        "GOOGLE_API_KEY": os.environ.get("GOOGLE_API_KEY"),
-        "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY")
-    }
-    
-    missing_keys = [k for k, v in api_keys.items() if not v]
-    
-    if missing_keys:
-        # Try to load from config
-        config = load_config()
-        for key in missing_keys:
-            key_lower = key.lower()
-            if config.get(key_lower):
-                os.environ[key] = config[key_lower]
-                missing_keys.remove(key)
-    
-    # Check if we have at least one API key
-    if "GOOGLE_API_KEY" not in missing_keys:
-        return True  # We have Google API key, we're good to go
-    elif "OPENAI_API_KEY" not in missing_keys:
-        return True  # We have OpenAI API key, we're good to go
-    else:
-        console.print("[yellow]Warning: No API keys found. You need to configure at least one of these:[/yellow]")
-        console.print("[yellow]- Google API Key (for Gemini models)[/yellow]")
-        console.print("[yellow]- OpenAI API Key (for GPT models)[/yellow]")
-        console.print("[yellow]Run 'research-pal configure' to set them up.[/yellow]")
-        return False
+class LazyGroup(click.Group):
+    """Click group that imports subcommands only when they are invoked."""
+
+    def __init__(self, *args, lazy_commands=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # name -> (module, attribute) of the command object
+        self.lazy_commands = lazy_commands or {}
+
+    def list_commands(self, ctx):
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_commands))
 
-@click.group()
+    def get_command(self, ctx, name):
+        if name in self.lazy_commands:
+            module_name, attr = self.lazy_commands[name]
+            module = importlib.import_module(module_name)
+            return getattr(module, attr)
+        return super().get_command(ctx, name)
+
+_LAZY_COMMANDS = {
+    "configure": ("research_pal.cli._commands", "configure"),
+    "shell": ("research_pal.cli._commands", "shell"),
+    "run": ("research_pal.cli._commands", "run"),
+    "version": ("research_pal.cli._commands", "version"),
+    "test": ("research_pal.cli._commands", "test"),
+}
+
+@click.group(cls=LazyGroup, lazy_commands=_LAZY_COMMANDS)
 @click.option('--debug/--no-debug', default=False, help='Enable debug logging.')
-@click.option('--theme', type=click.Choice(['cyberpunk', 'matrix', 'midnight', 'minimal', 'professional']), 
+@click.option('--theme', type=click.Choice(THEME_NAMES),
               default='minimal', help='Choose UI color theme.')
 @click.pass_context
 def cli(ctx, debug, theme):
@@ -77,204 +69,15 @@ def cli(ctx, debug, theme):
     if debug:
         logger.setLevel(logging.DEBUG)
         logging.getLogger().setLevel(logging.DEBUG)
-    
+
     # Store debug flag and theme in context
     ctx.ensure_object(dict)
     ctx.obj['DEBUG'] = debug
     ctx.obj['THEME'] = theme
-    
+
     # Set theme globally
     set_theme(theme)
 
-@cli.command()
-@click.option('--config-path', '-c', default=CONFIG_PATH, help='Path to configuration file.')
-@click.pass_context
-def configure(ctx, config_path):
-    """Configure ResearchPal settings."""
-    # Load existing config if available
-    config = load_config(config_path)
-    
-    # Display logo first
-    display_fancy_logo(console, theme=ctx.obj['THEME'], animated=False)
-    
-    # Prompt for configuration values
-    console.print("\n[bold]ResearchPal Configuration[/bold]\n")
-    
-    console.print("[bold]API Keys:[/bold]")
-    openai_api_key = click.prompt("OpenAI API Key", default=config.get("openai_api_key", ""))
-    google_api_key = click.prompt("Google AI API Key (for Gemini Flash)", default=config.get("google_api_key", ""))
-    
-    console.print("\n[bold]LLM Settings:[/bold]")
-    default_model = click.prompt("Default LLM Model", 
-                                default=config.get("default_model", DEFAULT_CONFIG["default_model"]),
-                                type=click.Choice(["gpt-4o-mini", "gpt-4o", "gemini-1.5-flash", "gemini-1.5-pro"]))
-    
-    output_token_limit = click.prompt("Default Output Token Limit", 
-                                     default=config.get("output_token_limit", 4096),
-                                     type=int)
-    
-    console.print("\n[bold]Database Settings:[/bold]")
-    db_path = click.prompt("Database Path", default=config.get("db_path", DEFAULT_CONFIG["db_path"]))
-    
-    console.print("\n[bold]Output Settings:[/bold]")
-    output_dir = click.prompt("Default Output Directory", default=config.get("output_dir", DEFAULT_CONFIG["output_dir"]))
-    
-    console.print("\n[bold]UI Settings:[/bold]")
-    theme = click.prompt("UI Theme", 
-                         default=config.get("theme", ctx.obj['THEME']),
-                         type=click.Choice(["cyberpunk", "matrix", "midnight", "minimal", "professional"]))
-    
-    disable_animations = click.confirm("Disable animations?", 
-                                      default=config.get("disable_animations", config.get("theme") in ["minimal", "professional"]))
-    
-    # Update config
-    config.update({
-        "openai_api_key": openai_api_key,
-        "google_api_key": google_api_key,
-        "default_model": default_model,
-        "output_token_limit": output_token_limit,
-        "db_path": db_path,
-        "output_dir": output_dir,
-        "theme": theme,
-        "disable_animations": disable_animations
-    })
-    
-    # Save config
-    save_config(config, config_path)
-    console.print(f"\n[green]Configuration saved to {config_path}[/green]")
-    
-    # Set environment variables right away for current session
-    if openai_api_key:
-        os.environ["OPENAI_API_KEY"] = openai_api_key
-    if google_api_key:
-        os.environ["GOOGLE_API_KEY"] = google_api_key
-    
-    # Ask user if they want to enter the shell
-    if click.confirm("\nDo you want to enter the interactive shell now?", default=True):
-        ctx.invoke(shell, config_path=config_path, minimal=(theme in ["minimal", "professional"]))
-
-@cli.command()
-@click.option('--config-path', '-c', default=CONFIG_PATH, help='Path to configuration file.')
-@click.option('--minimal/--no-minimal', default=None, help='Use minimal UI design.')
-@click.option('--no-animation/--animation', default=None, help='Disable startup animation.')
-@click.pass_context
-def shell(ctx, config_path, minimal, no_animation):
-    """Start the interactive shell."""
-    # Check environment setup
-    check_environment()
-    
-    # Load config to check for user preferences
-    config = load_config(config_path)
-    
-    # Set minimal mode based on theme if not explicitly specified
-    if minimal is None:
-        minimal = config.get("theme") in ["minimal", "professional"]
-    
-    # Use config's animation setting if not specified in command
-    if no_animation is None:
-        no_animation = config.get("disable_animations", False)
-    
-    # Pass debug flag, theme, and animation settings to the shell
-    debug = ctx.obj.get('DEBUG', False)
-    theme = ctx.obj.get('THEME', config.get("theme", "minimal"))
-    animation = not no_animation
-    
-    # Run the interactive shell
-    run_interactive_shell(
-        config_path=config_path, 
-        debug=debug, 
-        minimal=minimal,
-        theme=theme,
-        animation=animation
-    )
-
-@cli.command()
-@click.pass_context
-def run(ctx):
-    """Default command, starts the interactive shell."""
-    ctx.invoke(shell)
-
-@cli.command()
-def version():
-    """Display the version information."""
-    from importlib.metadata import version as get_version
-    
-    try:
-        version = get_version("research-pal")
-    except:
-        version = "1.0.0"  # Default if not installed as package
-    
-    console.print(f"[bold]ResearchPal[/bold] version [cyan]{version}[/cyan]")
-    console.print("Your AI-powered research paper assistant")
-
-@cli.command()
-@click.argument('file_path', type=click.Path(exists=True))
-@click.option('--test-api', is_flag=True, help='Test API connectivity with minimal processing.')
-@click.pass_context
-def test(ctx, file_path, test_api):
-    """Test file processing and API connectivity."""
-    # Display logo
-    display_fancy_logo(console, theme=ctx.obj['THEME'], animated=False)
-    
-    if test_api:
-        console.print("[bold]Testing API Connectivity...[/bold]")
-        
-        async def test_apis():
-            llm_interface = LLMInterface()
-            
-            # Test OpenAI API
-            console.print("\n[bold]Testing OpenAI API...[/bold]")
-            try:
-                response = await llm_interface.query_openai(
-                    prompt="Say 'Hello from GPT' if you can read this.",
-                    max_tokens=20
-                )
-                console.print(f"[green]Success! Response: {response}[/green]")
-            except Exception as e:
-                console.print(f"[red]Failed to connect to OpenAI API: {e}[/red]")
-            
-            # Test Google/Gemini API
-            console.print("\n[bold]Testing Google API (Gemini)...[/bold]")
-            try:
-                response = await llm_interface.query_google(
-                    prompt="Say 'Hello from Gemini' if you can read this.",
-                    max_tokens=20
-                )
-                console.print(f"[green]Success! Response: {response}[/green]")
-            except Exception as e:
-                console.print(f"[red]Failed to connect to Google API: {e}[/red]")
-        
-        asyncio.run(test_apis())
-    else:
-        # Test file processing
-        console.print(f"[bold]Testing file processing for: {file_path}[/bold]")
-        
-        from research_pal.core.pdf_processor import PDFProcessor
-        
-        processor = PDFProcessor()
-        
-        try:
-            with console.status("[bold green]Processing file...[/bold green]"):
-                result = processor.extract_and_chunk(file_path)
-            
-            console.print(f"[green]Successfully processed file![/green]")
-            console.print(f"[bold]Metadata:[/bold] {result['metadata']}")
-            console.print(f"[bold]Extracted {result['chunk_count']} chunks[/bold]")
-            console.print(f"[bold]Found {len(result.get('highlighted_text', []))} highlighted sections[/bold]")
-            console.print(f"[bold]Detected {len(result.get('figures_tables', []))} figures/tables[/bold]")
-            
-            # Show sample content
-            if result['chunks']:
-                console.print("\n[bold]Sample content (first 300 chars):[/bold]")
-                console.print(result['chunks'][0][:300] + "...")
-            
-        except Exception as e:
-            console.print(f"[red]Error processing file: {e}[/red]")
-    
-    # Ask user if they want to enter the shell
-    if click.confirm("\nDo you want to enter the interactive shell now?", default=True):
-        ctx.invoke(shell)
-
 def main():
     """Main entry point."""
     # If run directly without arguments, launch the shell
@@ -283,4 +86,4 @@ def main():
     cli(obj={})
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
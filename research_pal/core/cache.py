@@ -0,0 +1,248 @@
+"""
+Response cache for ResearchPal LLM queries.
+
+Identical deterministic requests (same model, prompt, system message and
+temperature) return the stored response instead of paying API latency and
+cost again - reruns of the same paper hit the cache heavily.
+"""
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Optional zstd compression for stored responses: completion JSON shrinks
+# ~3-5x and decompression is far cheaper than the extra disk I/O it saves.
+# Entries carry the zstd magic bytes, so mixed stores read back fine.
+try:
+    import zstandard as _zstd
+    _ZSTD_COMPRESS = _zstd.ZstdCompressor(level=3)
+    _ZSTD_DECOMPRESS = _zstd.ZstdDecompressor()
+except ImportError:
+    _zstd = None
+
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# Environment variable that enables the cache and selects its directory
+CACHE_DIR_ENV = "RESEARCHPAL_CACHE_DIR"
+
+# Set to a non-empty value (alongside CACHE_DIR_ENV) to enable the semantic
+# cache tier; requires the optional sentence-transformers dependency
+SEMANTIC_CACHE_ENV = "RESEARCHPAL_SEMANTIC_CACHE"
+
+# Optional override for the semantic tier's cosine-similarity threshold;
+# higher values trade hit rate for stricter matches
+SEMANTIC_THRESHOLD_ENV = "RESEARCHPAL_SEMANTIC_THRESHOLD"
+
+class ResponseCache:
+    """SQLite-backed cache of LLM responses keyed by request hash."""
+
+    def __init__(self,
+                 cache_dir: str,
+                 ttl_seconds: int = 30 * 86400,
+                 max_entries: int = 10000):
+        """
+        Initialize the response cache.
+
+        Args:
+            cache_dir: Directory for the cache database
+            ttl_seconds: Entries older than this are treated as misses
+            max_entries: Oldest entries are evicted beyond this count
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        cache_dir = os.path.expanduser(cache_dir)
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self._conn = sqlite3.connect(
+            os.path.join(cache_dir, "responses.db"),
+            check_same_thread=False
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(key TEXT PRIMARY KEY, response TEXT, created_at INTEGER)"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+        # Session counters, surfaced in pipeline logs to show how much
+        # paid work the cache is absorbing
+        self.stats = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def make_key(model: str, prompt: str, system_message: str,
+                 temperature: float, max_tokens: int) -> str:
+        """Build a content hash of the canonicalized request."""
+        payload = json.dumps(
+            {"m": model, "p": prompt, "s": system_message,
+             "t": temperature, "mx": max_tokens},
+            sort_keys=True
+        )
+        # blake2b is markedly faster than sha256 on multi-KB prompts and
+        # collision resistance is equivalent for cache-key purposes
+        return hashlib.blake2b(payload.encode(), digest_size=32).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for a key, or None on miss/expiry."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+
+        if row is None:
+            self.stats["misses"] += 1
+            return None
+
+        response, created_at = row
+        if time.time() - created_at > self.ttl_seconds:
+            self.stats["misses"] += 1
+            return None
+
+        self.stats["hits"] += 1
+        if isinstance(response, bytes):
+            if _zstd is not None and response[:4] == _ZSTD_MAGIC:
+                response = _ZSTD_DECOMPRESS.decompress(response)
+            return response.decode()
+
+        return response
+
+    def set(self, key: str, response: str) -> None:
+        """Store a response, evicting the oldest entries beyond max_entries."""
+        blob = (_ZSTD_COMPRESS.compress(response.encode())
+                if _zstd is not None else response)
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, response, created_at) "
+                    "VALUES (?, ?, ?)",
+                    (key, blob, int(time.time()))
+                )
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM responses ORDER BY created_at DESC "
+                    "LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+                self._conn.commit()
+        except Exception as e:
+            logger.warning(f"Failed to write response cache entry: {e}")
+
+class SemanticCache:
+    """
+    Second-tier cache that matches near-duplicate prompts by embedding
+    similarity, catching paraphrased requests the exact-hash cache misses
+    (e.g. papers sharing boilerplate methodology sections).
+    """
+
+    def __init__(self, cache_dir: str, threshold: float = 0.95):
+        """
+        Initialize the semantic cache.
+
+        Args:
+            cache_dir: Directory for the embedding/response store
+            threshold: Minimum cosine similarity to treat as a hit
+        """
+        # Deferred so the exact-match cache works without the optional deps
+        import numpy as np
+        from sentence_transformers import SentenceTransformer
+
+        self._np = np
+        self.threshold = threshold
+        self._model = SentenceTransformer("all-MiniLM-L6-v2")
+
+        cache_dir = os.path.expanduser(cache_dir)
+        os.makedirs(cache_dir, exist_ok=True)
+        self._store_path = os.path.join(cache_dir, "semantic_cache.jsonl")
+        self._emb_path = os.path.join(cache_dir, "semantic_cache.npy")
+
+        self._entries = []  # list of {"tag": ..., "response": ...}
+        self._embeddings = np.empty((0, 384), dtype=np.float16)
+        self._lock = threading.Lock()
+        self._load()
+
+        # Session counters, mirroring ResponseCache.stats
+        self.stats = {"hits": 0, "misses": 0}
+
+    def _load(self) -> None:
+        try:
+            if os.path.exists(self._store_path) and os.path.exists(self._emb_path):
+                with open(self._store_path) as f:
+                    self._entries = [json.loads(line) for line in f if line.strip()]
+                self._embeddings = self._np.load(self._emb_path)
+        except Exception as e:
+            logger.warning(f"Could not load semantic cache, starting empty: {e}")
+            self._entries = []
+            self._embeddings = self._np.empty((0, 384), dtype=self._np.float16)
+
+    def _embed(self, text: str):
+        emb = self._model.encode([text], normalize_embeddings=True)[0]
+        return emb.astype(self._np.float16)
+
+    @staticmethod
+    def make_tag(model: str, temperature: float) -> str:
+        """Tag ensuring hits only come from the same model/temperature."""
+        return f"{model}@{temperature}"
+
+    def get(self, text: str, tag: str) -> Optional[str]:
+        """Return the stored response for the nearest prompt above threshold."""
+        with self._lock:
+            if not self._entries:
+                self.stats["misses"] += 1
+                return None
+            emb = self._embed(text)
+            scores = self._embeddings.astype(self._np.float32) @ emb.astype(self._np.float32)
+            best = int(scores.argmax())
+            if scores[best] >= self.threshold and self._entries[best]["tag"] == tag:
+                self.stats["hits"] += 1
+                return self._entries[best]["response"]
+        self.stats["misses"] += 1
+        return None
+
+    def set(self, text: str, tag: str, response: str) -> None:
+        """Insert a prompt embedding and its response."""
+        try:
+            with self._lock:
+                emb = self._embed(text)
+                self._embeddings = self._np.vstack([self._embeddings, emb[None, :]])
+                self._entries.append({"tag": tag, "response": response})
+                with open(self._store_path, "a") as f:
+                    f.write(json.dumps({"tag": tag, "response": response}) + "\n")
+                self._np.save(self._emb_path, self._embeddings)
+        except Exception as e:
+            logger.warning(f"Failed to write semantic cache entry: {e}")
+
+def get_default_semantic_cache() -> Optional["SemanticCache"]:
+    """Build a SemanticCache from the environment, or None when disabled."""
+    cache_dir = os.environ.get(CACHE_DIR_ENV)
+    if not cache_dir or not os.environ.get(SEMANTIC_CACHE_ENV):
+        return None
+    try:
+        threshold = float(os.environ.get(SEMANTIC_THRESHOLD_ENV, 0.95))
+        return SemanticCache(cache_dir, threshold=threshold)
+    except ImportError:
+        logger.warning(
+            "Semantic cache requested but sentence-transformers is not "
+            "installed; falling back to exact-match caching only"
+        )
+        return None
+    except Exception as e:
+        logger.warning(f"Could not initialize semantic cache: {e}")
+        return None
+
+def get_default_cache() -> Optional[ResponseCache]:
+    """Build a ResponseCache from the environment, or None when disabled."""
+    cache_dir = os.environ.get(CACHE_DIR_ENV)
+    if not cache_dir:
+        return None
+    try:
+        return ResponseCache(cache_dir)
+    except Exception as e:
+        logger.warning(f"Could not initialize response cache: {e}")
+        return None
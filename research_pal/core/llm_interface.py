@@ -3,27 +3,536 @@ LLM Interface for ResearchPal - Enhanced version with better Gemini support.
 """
 import os
 import json
+import time
+import asyncio
+import hashlib
 import logging
+import functools
 import re
-from typing import Dict, List, Any, Optional, Union
+import random
+import textwrap
+import types
+from typing import Callable, Dict, List, Any, Optional, Union
 import httpx
-from tenacity import retry, stop_after_attempt, wait_random_exponential, retry_if_exception_type
+
+from research_pal.core.cache import (
+    ResponseCache, SemanticCache, get_default_cache, get_default_semantic_cache
+)
+from research_pal.core.prompts import COMPREHENSIVE_ANALYSIS_PROMPT
 
 logger = logging.getLogger(__name__)
 
+# Set to a non-empty value to route large summarization jobs through the
+# OpenAI Batch API (half price, up to 24h turnaround) instead of real-time
+BATCH_MODE_ENV = "RESEARCHPAL_BATCH_MODE"
+
+# orjson decodes multi-KB responses considerably faster than stdlib json;
+# fall back silently when it isn't installed
+try:
+    import orjson as _fast_json
+except ImportError:
+    _fast_json = None
+
+# Optional: simdjson's on-demand parser materializes only the fields that
+# are actually read, which beats a full tree build on 10KB+ recommendation
+# payloads
+try:
+    import simdjson as _simdjson
+    _SIMD_PARSER = _simdjson.Parser()
+except ImportError:
+    _SIMD_PARSER = None
+
+# Below this size a full orjson decode wins; lazy parsing only pays off
+# once there is a tree worth skipping
+_SIMD_MIN_BYTES = 10_000
+
+# Optional: accurate token counting for request sizing; a cheap character
+# heuristic keeps things working when tiktoken isn't installed
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# How many chunk summaries to fold into each super-summary when a merge
+# prompt would overflow the model's context window
+_MERGE_FANOUT = 8
+
+# Compiled once; extracts fenced Python code blocks from model responses
+_PY_CODE_RE = re.compile(r"```python(.*?)```", re.DOTALL)
+
+# HTTP statuses worth retrying: rate limits and transient server errors.
+# Other 4xx responses are permanent failures and retrying only wastes quota.
+_RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+# Model mappings and configurations. Module-level and read-only: every
+# LLMInterface shares one table instead of rebuilding the literal per
+# instance, and the proxy guards against accidental mutation.
+MODEL_CONFIGS = types.MappingProxyType({
+    # OpenAI models
+    "gpt-4o-mini": {
+        "provider": "openai",
+        "max_tokens": 128000,  # Input context
+        "max_output_tokens": 4096,
+        "cost_per_1k_input": 0.15,  # USD per 1k tokens
+        "cost_per_1k_output": 0.60,
+        "capabilities": ["text", "code", "reasoning"]
+    },
+    "gpt-4o": {
+        "provider": "openai",
+        "max_tokens": 128000,
+        "max_output_tokens": 4096,
+        "cost_per_1k_input": 5.00,
+        "cost_per_1k_output": 15.00,
+        "capabilities": ["text", "code", "vision", "reasoning"]
+    },
+
+    # Google/Gemini models
+    "gemini-1.5-flash": {
+        "provider": "google",
+        "model_name": "gemini-1.5-flash-latest",
+        "max_tokens": 1000000,
+        "max_output_tokens": 8192,
+        "cost_per_1k_input": 0.00035,
+        "cost_per_1k_output": 0.00085,
+        "capabilities": ["text", "code", "vision"]
+    },
+    "gemini-1.5-flash-2.0": {
+        "provider": "google",
+        "model_name": "gemini-1.5-flash-2.0-experimental",
+        "max_tokens": 1000000,
+        "max_output_tokens": 8192,
+        "cost_per_1k_input": 0.0005, # Experimental pricing
+        "cost_per_1k_output": 0.0015, # Experimental pricing
+        "capabilities": ["text", "code", "vision", "reasoning"]
+    },
+    "gemini-1.5-pro": {
+        "provider": "google",
+        "model_name": "gemini-1.5-pro-latest",
+        "max_tokens": 1000000,
+        "max_output_tokens": 8192,
+        "cost_per_1k_input": 0.00125,
+        "cost_per_1k_output": 0.00375,
+        "capabilities": ["text", "code", "vision", "reasoning"]
+    },
+})
+
+# Memoized provider / API-name lookups; the table is immutable so these
+# never need invalidation
+_PROVIDER_CACHE: Dict[str, str] = {}
+_MODEL_NAME_CACHE: Dict[str, str] = {}
+
+@functools.lru_cache(maxsize=8)
+def _get_encoder(model_name: str):
+    """Resolve (and cache) the tiktoken encoder for a model, or None."""
+    if tiktoken is None:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model_name)
+        except KeyError:
+            # Non-OpenAI models (e.g. Gemini) aren't registered; cl100k_base
+            # is a close enough approximation for budget arithmetic
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        # tiktoken fetches encoding files on first use; fall back to the
+        # character heuristic when that fails (e.g. offline environments)
+        return None
+
+def _count_tokens(text: str, model_name: str) -> int:
+    """Count the tokens in a text for a model (approximate without tiktoken)."""
+    # Gemini uses its own tokenizer; rather than BPE-encoding (or a
+    # countTokens network round trip per chunk), a character heuristic is
+    # plenty for budget arithmetic against a 1M-token context
+    if not model_name.startswith("gpt"):
+        return len(text) // 4 + 1
+
+    enc = _get_encoder(model_name)
+    if enc is not None:
+        return len(enc.encode(text))
+    # ~4 characters per token is a serviceable estimate for English prose
+    return len(text) // 4 + 1
+
+def _truncate_tokens(text: str, max_tokens: int,
+                     model_name: str = "gpt-4o-mini") -> str:
+    """Trim a text to at most max_tokens tokens (approximate without tiktoken)."""
+    enc = _get_encoder(model_name)
+    if enc is None:
+        # Character heuristic mirroring _count_tokens
+        return text[:max_tokens * 4]
+    tokens = enc.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    return enc.decode(tokens[:max_tokens])
+
+def _json_loads(data: Union[str, bytes]) -> Any:
+    """Decode JSON with orjson when available, stdlib json otherwise."""
+    if _fast_json is not None:
+        return _fast_json.loads(data)
+    return json.loads(data)
+
+def _json_dumps(data: Any) -> bytes:
+    """
+    Encode JSON to bytes with orjson when available.
+
+    Returning bytes lets httpx send the body via content= without the
+    encode-to-str-then-to-bytes round trip of the json= shortcut.
+    """
+    if _fast_json is not None:
+        return _fast_json.dumps(data)
+    return json.dumps(data).encode()
+
+def _json_dumps_indented(data: Any) -> str:
+    """Pretty-print JSON for prompt embedding (orjson when available)."""
+    if _fast_json is not None:
+        return _fast_json.dumps(data, option=_fast_json.OPT_INDENT_2).decode()
+    return json.dumps(data, indent=2)
+
+def _extract_json(response: str) -> Optional[Any]:
+    """
+    Extract and parse the outermost JSON object or array from a response.
+
+    Walks the string once tracking brace depth and string/escape state, so
+    stray braces inside code blocks or quoted text don't break extraction
+    (unlike the old find('{')/rfind('}') slicing).
+
+    Returns:
+        The parsed value, or None if no parseable JSON was found.
+    """
+    start = None
+    opener = closer = None
+    depth = 0
+    in_string = False
+    escaped = False
+
+    for i, ch in enumerate(response):
+        if start is None:
+            if ch == '{' or ch == '[':
+                start = i
+                opener = ch
+                closer = '}' if ch == '{' else ']'
+                depth = 1
+            continue
+
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            continue
+
+        if ch == '"':
+            in_string = True
+        elif ch == opener:
+            depth += 1
+        elif ch == closer:
+            depth -= 1
+            if depth == 0:
+                try:
+                    return _json_loads(response[start:i + 1])
+                except (ValueError, TypeError):
+                    return None
+
+    return None
+
+class _JsonCompletionTracker:
+    """
+    Incremental bracket-depth tracker over streamed text deltas.
+
+    feed() returns True once the first JSON object or array has closed,
+    letting a streaming consumer stop reading before the model finishes
+    emitting trailing prose. Mirrors _extract_json's string/escape handling.
+    """
+
+    def __init__(self):
+        self._opener = None
+        self._closer = None
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self.complete = False
+
+    def feed(self, delta: str) -> bool:
+        if self.complete:
+            return True
+        for ch in delta:
+            if self._opener is None:
+                if ch == '{' or ch == '[':
+                    self._opener = ch
+                    self._closer = '}' if ch == '{' else ']'
+                    self._depth = 1
+                continue
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == '\\':
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+            if ch == '"':
+                self._in_string = True
+            elif ch == self._opener:
+                self._depth += 1
+            elif ch == self._closer:
+                self._depth -= 1
+                if self._depth == 0:
+                    self.complete = True
+                    return True
+        return False
+
+# Prompt templates. Dedented once at import: triple-quoted strings inside
+# methods carry the source indentation into the actual prompt, inflating
+# input tokens (and prefill cost) by several percent on every call.
+_CHUNK_SYSTEM_PROMPT = textwrap.dedent("""\
+    You are ResearchPal, an expert research assistant specializing in scientific literature analysis.
+    Your task is to analyze a chunk of text from a research paper and extract key information.
+
+    Be precise, factual, and comprehensive. Focus on identifying:
+    1. Main concepts and contributions
+    2. Methodologies described
+    3. Results presented
+    4. Important mathematical formulations
+    5. Model architectures (if applicable)
+
+    If this chunk appears to be from the introduction, provide more context about the paper's goals.
+    If this chunk appears to be from the methodology, focus on technical details.
+    If this chunk appears to be from the results section, focus on findings and evaluation.
+    If this chunk appears to be from the conclusion, summarize the paper's contributions.
+
+    Extract any numerical results, key figures, tables, or important equations.""")
+
+_CHUNK_PROMPT_TEMPLATE = textwrap.dedent("""\
+    Analyze the following chunk of text from a research paper titled "{title}":
+
+    ```
+    {chunk}
+    ```
+
+    First determine which section(s) of the paper this chunk belongs to.
+    {position_hints}
+    Provide a detailed analysis of this chunk with the following information:
+
+    1. SECTION_IDENTIFICATION: Identify which section(s) of the paper this chunk belongs to
+    2. SUMMARY: Summarize the key information in this chunk (200-300 words)
+    3. KEY_FINDINGS: List up to 5 key findings or points from this chunk
+    4. TECHNICAL_DETAILS: Extract any important technical details, methodologies, or algorithms
+    5. MATH_FORMULATIONS: Extract any important mathematical formulations or equations
+    6. ARCHITECTURE_DETAILS: If a model architecture is described, provide details
+    7. RESULTS: Extract any experimental results or evaluations
+
+    Format your response as a JSON object with these fields.""")
+
+_MERGE_SYSTEM_PROMPT = textwrap.dedent("""\
+    You are ResearchPal, an expert research assistant specializing in scientific literature analysis.
+    Your task is to create a comprehensive, well-structured summary of a research paper based on section summaries.
+
+    Be precise, factual, and comprehensive. Organize the information logically.
+    Focus on presenting the paper's contributions, methodologies, results, and implications.
+
+    Your summary should be suitable for a researcher who wants to understand the paper without reading it entirely.""")
+
+_MERGE_PROMPT_TEMPLATE = textwrap.dedent("""\
+    Create a comprehensive summary of the research paper titled "{title}" by {authors}.
+
+    I'll provide you with summaries from different sections of the paper. Please synthesize this information into a cohesive, well-structured summary of the entire paper.
+
+    Here are the section summaries:
+
+    {combined_summary}
+
+    Here are the key findings identified across the paper:
+    {key_findings}
+
+    Technical details and methodologies:
+    {tech_details}
+
+    Mathematical formulations:
+    {math_formulations}
+
+    Architecture details (if applicable):
+    {architecture_details}
+
+    Results and evaluations:
+    {results}
+
+    Please provide a comprehensive summary with the following sections:
+    1. OVERVIEW: A brief overview of the paper (100-150 words)
+    2. PROBLEM_STATEMENT: The problem addressed by the paper
+    3. METHODOLOGY: The approach and methods used
+    4. ARCHITECTURE: Detailed architecture description (if applicable)
+    5. KEY_RESULTS: The main results and findings
+    6. IMPLICATIONS: Implications and importance of the work
+    7. TAKEAWAYS: Major takeaways (in bullet points)
+    8. FUTURE_DIRECTIONS: Potential future research directions mentioned or implied
+    9. BACKGROUND: Important background information
+    10. MATH_FORMULATIONS: Important mathematical formulations (if applicable)
+
+    Format your response as a JSON object with these fields.""")
+
+_ANALYSIS_PROMPT_TEMPLATE = textwrap.dedent("""\
+    Generate a comprehensive analysis of the paper titled "{paper_title}" based on the following summary:
+
+    Overview:
+    {overview}
+
+    Problem Statement:
+    {problem}
+
+    Methodology:
+    {methodology}
+
+    Key Results:
+    {results}
+
+    Implications:
+    {implications}
+
+    Please provide the analysis in the requested format with TAKEAWAYS, IMPORTANT_IDEAS, FUTURE_IDEAS, NOVELTY, LIMITATIONS, PRACTICAL_APPLICATIONS, and RELATED_WORK sections.""")
+
+_CODE_SYSTEM_PROMPT = textwrap.dedent("""\
+    You are ResearchPal, an expert in implementing machine learning and deep learning architectures from research papers.
+    Your task is to generate clean, working Python code that implements the architecture described in a research paper.
+
+    Use PyTorch as the default framework unless otherwise specified.
+    Include comprehensive comments explaining each part of the implementation.
+    Follow best practices for code organization and structure.
+    Make reasonable assumptions when details are unclear, and document these assumptions in comments.""")
+
+_CODE_PROMPT_TEMPLATE = textwrap.dedent("""\
+    Generate a Python implementation of the model architecture described in the paper titled "{paper_title}".
+
+    Here is the description of the architecture:
+
+    ```
+    {architecture_details}
+    ```
+
+    Please provide a complete, working implementation that includes:
+
+    1. All necessary imports
+    2. The model class(es) definition
+    3. Any helper functions or utility classes needed
+    4. Example usage showing how to instantiate and use the model
+    5. Comprehensive comments explaining the implementation
+
+    Make reasonable assumptions if some details are not provided, and document these assumptions in comments.
+
+    The code should follow best practices and be ready to use with minimal modifications.""")
+
+_SIMILAR_SYSTEM_PROMPT = textwrap.dedent("""\
+    You are ResearchPal, an expert research assistant with extensive knowledge of scientific literature.
+    Your task is to recommend similar papers based on the summary of a given paper.
+
+    Provide recommendations that are relevant, diverse, and high-quality.
+    Include both seminal works and recent advances in the field.
+    For each recommendation, provide the title, authors, year, and a brief explanation of its relevance.""")
+
+_SIMILAR_PAPERS_TEMPLATE = textwrap.dedent("""\
+    Based on the following summary of the paper titled "{title}", recommend 5 similar papers that would be relevant to someone interested in this research.
+
+    Paper Overview:
+    {overview}
+
+    Problem Statement:
+    {problem}
+
+    Methodology:
+    {methodology}
+
+    Please recommend 5 papers that are:
+    1. Closely related to this research topic
+    2. A mix of foundational papers and recent advances
+    3. Diverse in their approaches to the problem
+
+    For each recommendation, provide:
+    - Title
+    - Authors
+    - Year of publication (approximate if unsure)
+    - A brief explanation of why it's relevant to someone interested in the original paper
+
+    Format your response as a JSON array of objects with these fields.""")
+
+_BLOG_SYSTEM_PROMPT = textwrap.dedent("""\
+    You are ResearchPal, an expert in communicating complex research in an accessible way.
+    Your task is to generate a well-structured, engaging blog post about a research paper that balances technical accuracy with readability.
+
+    The blog post should:
+    1. Have an engaging title and introduction
+    2. Explain the paper's significance and context
+    3. Break down complex concepts using analogies when helpful
+    4. Include section headings for better readability
+    5. End with implications and takeaways
+
+    Adapt your writing style to match the sample provided, if available.""")
+
+_BLOG_PROMPT_TEMPLATE = textwrap.dedent("""\
+    Write an engaging blog post about the research paper titled "{paper_title}" based on the following summary:
+
+    Overview:
+    {overview}
+
+    Problem Statement:
+    {problem}
+
+    Methodology:
+    {methodology}
+
+    Key Results:
+    {results}
+
+    Implications:
+    {implications}
+
+    Write the post in Markdown with section headings. Balance technical accuracy with readability for a broad technical audience.""")
+
 class LLMInterface:
     """Interface for interacting with various LLM APIs."""
     
-    def __init__(self, default_model: str = None):
+    def __init__(self, default_model: str = None, max_connections: int = 100,
+                 max_concurrency: int = 8, summary_token_budget: int = 400,
+                 max_concurrent_requests: int = 16):
         """
         Initialize the LLM interface.
-        
+
         Args:
             default_model: Default model to use for queries
+            max_connections: Connection pool size for the shared HTTP client
+            max_concurrency: Maximum in-flight requests for batch helpers
+                (tune to your provider's rate-limit tier)
+            summary_token_budget: Per-field token cap applied to summary
+                excerpts injected into derived prompts (recommendations etc.)
+            max_concurrent_requests: Hard instance-wide cap on in-flight
+                API calls, across all helpers; the last defence against
+                tripping provider rate limits when fan-outs overlap
         """
+        self.max_concurrency = max_concurrency
+        self.summary_token_budget = summary_token_budget
+
+        # Instance-wide limiter: individual fan-out helpers carry their own
+        # semaphores, but concurrent pipelines (chunks + recommendations +
+        # analysis) can stack, and this bounds the combined burst. Created
+        # lazily per event loop (see the _request_semaphore property)
+        # because asyncio primitives bind to the loop they first wait on
+        self._max_concurrent_requests = max_concurrent_requests
+        self._request_semaphores: Dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
+
+        # Optional response cache, enabled via RESEARCHPAL_CACHE_DIR
+        self.response_cache = get_default_cache()
+
+        # Optional embedding-similarity tier (RESEARCHPAL_SEMANTIC_CACHE)
+        self.semantic_cache = get_default_semantic_cache()
         # API keys should be set in environment variables
         self.openai_api_key = os.environ.get("OPENAI_API_KEY")
         self.google_api_key = os.environ.get("GOOGLE_API_KEY")
+
+        # HTTP clients are created lazily, one per running event loop (see
+        # the _client property): keep-alive connections avoid a fresh
+        # TCP+TLS handshake per request, but a pool is only valid on the
+        # loop that opened it
+        self._max_connections = max_connections
+        self._clients: Dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
         
         # Determine default model based on available API keys
         if default_model is None:
@@ -49,56 +558,17 @@ class LLMInterface:
                 logger.warning(f"Switching to gemini-1.5-flash")
                 self.default_model = "gemini-1.5-flash"
         
-        # Model mappings and configurations
-        self.model_configs = {
-            # OpenAI models
-            "gpt-4o-mini": {
-                "provider": "openai",
-                "max_tokens": 128000,  # Input context
-                "max_output_tokens": 4096,
-                "cost_per_1k_input": 0.15,  # USD per 1k tokens
-                "cost_per_1k_output": 0.60,
-                "capabilities": ["text", "code", "reasoning"]
-            },
-            "gpt-4o": {
-                "provider": "openai",
-                "max_tokens": 128000,
-                "max_output_tokens": 4096,
-                "cost_per_1k_input": 5.00,
-                "cost_per_1k_output": 15.00,
-                "capabilities": ["text", "code", "vision", "reasoning"]
-            },
-            
-            # Google/Gemini models
-            "gemini-1.5-flash": {
-                "provider": "google",
-                "model_name": "gemini-1.5-flash-latest",
-                "max_tokens": 1000000,
-                "max_output_tokens": 8192,
-                "cost_per_1k_input": 0.00035,
-                "cost_per_1k_output": 0.00085,
-                "capabilities": ["text", "code", "vision"]
-            },
-            "gemini-1.5-flash-2.0": {
-                "provider": "google",
-                "model_name": "gemini-1.5-flash-2.0-experimental",
-                "max_tokens": 1000000,
-                "max_output_tokens": 8192,
-                "cost_per_1k_input": 0.0005, # Experimental pricing
-                "cost_per_1k_output": 0.0015, # Experimental pricing
-                "capabilities": ["text", "code", "vision", "reasoning"]
-            },
-            "gemini-1.5-pro": {
-                "provider": "google",
-                "model_name": "gemini-1.5-pro-latest",
-                "max_tokens": 1000000,
-                "max_output_tokens": 8192,
-                "cost_per_1k_input": 0.00125,
-                "cost_per_1k_output": 0.00375,
-                "capabilities": ["text", "code", "vision", "reasoning"]
-            },
+        # Shared frozen model table; built once at import, not per instance
+        self.model_configs = MODEL_CONFIGS
+
+        # Provider dispatch table; adding a provider is one entry here plus
+        # its query method. Stored by name (resolved with getattr at call
+        # time) so per-instance patching of the query methods still works.
+        self._providers = {
+            "openai": "query_openai",
+            "google": "query_google"
         }
-        
+
         # Warning for missing API keys
         if not self.openai_api_key:
             logger.warning("OPENAI_API_KEY not found in environment variables")
@@ -106,6 +576,85 @@ class LLMInterface:
         if not self.google_api_key:
             logger.warning("GOOGLE_API_KEY not found in environment variables")
     
+    @property
+    def _client(self) -> httpx.AsyncClient:
+        """
+        The HTTP client for the running event loop, created on first use.
+
+        The interactive shell drives each command through its own
+        asyncio.run loop, and pooled keepalive connections are bound to the
+        loop that opened them - reusing the pool from a later loop raises
+        "Event loop is closed". Keying clients on the running loop gives
+        every loop its own pool while single-loop callers still share one
+        client across all their requests.
+        """
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            # Drop pools stranded on loops that have since closed; their
+            # connections are already dead
+            for stale in [l for l in self._clients if l.is_closed()]:
+                del self._clients[stale]
+            client = httpx.AsyncClient(
+                timeout=60.0,
+                limits=httpx.Limits(
+                    max_connections=self._max_connections,
+                    max_keepalive_connections=max(self._max_connections // 2, 1)
+                )
+            )
+            self._clients[loop] = client
+        return client
+
+    @property
+    def _request_semaphore(self) -> asyncio.Semaphore:
+        """
+        The instance-wide request limiter for the running event loop.
+
+        A semaphore acquired on one loop raises 'bound to a different
+        event loop' when waited on from another, so each loop gets its own
+        (created on first use, stale entries pruned alongside the clients).
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = self._request_semaphores.get(loop)
+        if semaphore is None:
+            for stale in [l for l in self._request_semaphores if l.is_closed()]:
+                del self._request_semaphores[stale]
+            semaphore = asyncio.Semaphore(self._max_concurrent_requests)
+            self._request_semaphores[loop] = semaphore
+        return semaphore
+
+    async def aclose(self) -> None:
+        """Close the HTTP client owned by the running loop, if any."""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    async def warmup(self) -> None:
+        """
+        Pre-establish TLS sessions to the configured providers.
+
+        First-call latency is dominated by the TCP+TLS handshake; issuing a
+        cheap request per provider at startup leaves live keepalive
+        connections in the pool for the first real query. Errors are ignored -
+        this is purely an optimization.
+        """
+        probes = []
+        if self.openai_api_key:
+            probes.append(self._client.head(
+                "https://api.openai.com/v1/models",
+                headers={"Authorization": f"Bearer {self.openai_api_key}"},
+                timeout=5.0
+            ))
+        if self.google_api_key:
+            probes.append(self._client.head(
+                "https://generativelanguage.googleapis.com/v1beta/models"
+                f"?key={self.google_api_key}",
+                timeout=5.0
+            ))
+
+        if probes:
+            await asyncio.gather(*probes, return_exceptions=True)
+
     def get_model_info(self, model_name: str = None) -> Dict[str, Any]:
         """Get information about a specific model."""
         if model_name is None:
@@ -117,45 +666,103 @@ class LLMInterface:
         """Determine which provider to use based on model."""
         if model is None:
             model = self.default_model
-        
-        model_info = self.get_model_info(model)
-        return model_info.get("provider", "openai")
-    
+
+        provider = _PROVIDER_CACHE.get(model)
+        if provider is None:
+            provider = MODEL_CONFIGS.get(model, {}).get("provider", "openai")
+            _PROVIDER_CACHE[model] = provider
+        return provider
+
     def _get_actual_model_name(self, model: str = None) -> str:
         """Get the actual API model name to use."""
         if model is None:
             model = self.default_model
-            
+
+        name = _MODEL_NAME_CACHE.get(model)
+        if name is None:
+            model_info = MODEL_CONFIGS.get(model, {})
+            # Google models map to a versioned API name; others pass through
+            if model_info.get("provider") == "google":
+                name = model_info.get("model_name", model)
+            else:
+                name = model
+            _MODEL_NAME_CACHE[model] = name
+        return name
+
+    async def _post_with_retry(self, url: str, max_attempts: int = 3, **kwargs) -> httpx.Response:
+        """
+        POST with jittered exponential backoff, honoring Retry-After.
+
+        Retries rate limits (429) and transient 5xx responses plus connection
+        failures; when the provider sends a Retry-After header its value
+        floors the backoff so we don't hammer a throttled endpoint.
+
+        Returns:
+            The successful (already status-checked) response.
+        """
+        for attempt in range(max_attempts):
+            retry_after = 0.0
+            try:
+                response = await self._client.post(url, **kwargs)
+                response.raise_for_status()
+                return response
+            except httpx.HTTPStatusError as e:
+                status = e.response.status_code
+                if status not in _RETRYABLE_STATUS or attempt == max_attempts - 1:
+                    raise
+                try:
+                    retry_after = float(e.response.headers.get("retry-after", 0))
+                except ValueError:
+                    retry_after = 0.0
+                logger.warning(f"Request to {url} failed with {status}, retrying")
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.ReadTimeout) as e:
+                if attempt == max_attempts - 1:
+                    raise
+                logger.warning(f"Request to {url} failed ({e!r}), retrying")
+
+            # Exponential backoff with full jitter, floored by Retry-After
+            backoff = random.uniform(0, min(2.0 * (2 ** attempt), 10.0))
+            await asyncio.sleep(max(retry_after, backoff))
+
+    def _clamp_max_tokens(self, max_tokens: int, prompt: str,
+                          system_message: str, model: str) -> int:
+        """
+        Clamp a requested output budget so input + output fits the model.
+
+        Keeps overlong requests from being truncated mid-response (often
+        mid-JSON) and avoids asking for more output than the model can emit.
+        """
         model_info = self.get_model_info(model)
-        
-        # If it's a Google model, use the model_name field
-        if model_info.get("provider") == "google":
-            return model_info.get("model_name", model)
-            
-        # Otherwise return the model name directly
-        return model
-    
-    @retry(
-        wait=wait_random_exponential(min=1, max=10),
-        stop=stop_after_attempt(3),
-        retry=retry_if_exception_type((httpx.HTTPStatusError, httpx.ConnectTimeout))
-    )
-    async def query_openai(self, 
-                          prompt: str, 
+        max_context = model_info.get("max_tokens", 128000)
+        max_output = model_info.get("max_output_tokens", max_tokens)
+
+        input_tokens = _count_tokens(prompt, model) + _count_tokens(system_message, model)
+        remaining = max_context - input_tokens - 64  # headroom for message framing
+
+        return max(min(max_tokens, max_output, remaining), 1)
+
+    async def query_openai(self,
+                          prompt: str,
                           system_message: str = "",
                           model: Optional[str] = None,
                           temperature: float = 0.0,
-                          max_tokens: int = 4000) -> str:
+                          max_tokens: int = 4000,
+                          stream_callback: Optional[Callable[[str], None]] = None,
+                          json_mode: bool = False) -> str:
         """
         Query OpenAI API with a prompt.
-        
+
         Args:
             prompt: User prompt to send to the API
             system_message: System message for context
             model: Model to use (defaults to self.default_model)
             temperature: Temperature parameter (0.0 = deterministic)
             max_tokens: Maximum number of tokens in the response
-            
+            stream_callback: When given, tokens stream via SSE and each text
+                delta is passed to this callback as it arrives; returning a
+                truthy value stops the stream early
+            json_mode: Ask the API for a pure-JSON response
+
         Returns:
             API response text
         """
@@ -190,41 +797,74 @@ class LLMInterface:
             "temperature": temperature,
             "max_tokens": max_tokens
         }
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
+
+        if json_mode:
+            data["response_format"] = {"type": "json_object"}
+
+        if stream_callback is not None:
+            # Stream deltas over SSE instead of waiting for the full body
+            data["stream"] = True
+            parts = []
+            async with self._client.stream(
+                "POST",
                 "https://api.openai.com/v1/chat/completions",
                 headers=headers,
-                json=data,
+                content=_json_dumps(data),
                 timeout=60.0
-            )
-            
-            response.raise_for_status()
-            result = response.json()
-            
-            return result["choices"][0]["message"]["content"]
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.startswith("data: "):
+                        continue
+                    payload = line[len("data: "):]
+                    if payload.strip() == "[DONE]":
+                        break
+                    try:
+                        delta = _json_loads(payload)["choices"][0]["delta"].get("content")
+                    except (ValueError, LookupError):
+                        continue
+                    if delta:
+                        parts.append(delta)
+                        if stream_callback(delta):
+                            # Caller has what it needs; closing the stream
+                            # here skips decoding the remaining tokens
+                            break
+
+            return "".join(parts)
+
+        response = await self._post_with_retry(
+            "https://api.openai.com/v1/chat/completions",
+            headers=headers,
+            content=_json_dumps(data),
+            timeout=60.0
+        )
+
+        result = _json_loads(response.content)
+
+        return result["choices"][0]["message"]["content"]
     
-    @retry(
-        wait=wait_random_exponential(min=1, max=10),
-        stop=stop_after_attempt(3),
-        retry=retry_if_exception_type((httpx.HTTPStatusError, httpx.ConnectTimeout))
-    )
     async def query_google(self,
                           prompt: str,
                           system_message: str = "",
                           model: str = None,
                           temperature: float = 0.0,
-                          max_tokens: int = 4000) -> str:
+                          max_tokens: int = 4000,
+                          stream_callback: Optional[Callable[[str], None]] = None,
+                          json_mode: bool = False) -> str:
         """
         Query Google AI Studio (Gemini) API with a prompt.
-        
+
         Args:
             prompt: User prompt to send to the API
             system_message: System message for context
             model: Model to use
             temperature: Temperature parameter
             max_tokens: Maximum number of tokens in the response
-            
+            stream_callback: When given, tokens stream via SSE and each text
+                delta is passed to this callback as it arrives; returning a
+                truthy value stops the stream early
+            json_mode: Ask the API for a pure-JSON response
+
         Returns:
             API response text
         """
@@ -249,22 +889,13 @@ class LLMInterface:
         # Construct the API URL with the API key
         url = f"https://generativelanguage.googleapis.com/v1beta/models/{model_name}:generateContent?key={self.google_api_key}"
         
-        # Prepare the content parts
-        contents = []
-        
-        if system_message:
-            # Add system message as a separate content item
-            contents.append({
-                "role": "user",
-                "parts": [{"text": f"<system>\n{system_message}\n</system>"}]
-            })
-        
-        # Add user prompt
-        contents.append({
+        # Only the user prompt goes in contents; the system message rides in
+        # the dedicated systemInstruction field below
+        contents = [{
             "role": "user",
             "parts": [{"text": prompt}]
-        })
-        
+        }]
+
         data = {
             "contents": contents,
             "generationConfig": {
@@ -280,78 +911,177 @@ class LLMInterface:
                 }
             ]
         }
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                url,
-                headers=headers,
-                json=data,
-                timeout=60.0
+
+        if system_message:
+            # The v1beta API's native system field: cheaper than wrapping the
+            # message in a fake user turn and eligible for server-side
+            # prefix caching of repeated system prompts
+            data["systemInstruction"] = {"parts": [{"text": system_message}]}
+
+        if json_mode:
+            data["generationConfig"]["responseMimeType"] = "application/json"
+
+        if stream_callback is not None:
+            # Stream partial candidates over SSE
+            stream_url = (
+                f"https://generativelanguage.googleapis.com/v1beta/models/"
+                f"{model_name}:streamGenerateContent?alt=sse&key={self.google_api_key}"
             )
-            
-            response.raise_for_status()
-            result = response.json()
-            
-            # Parse the response to extract the generated text
-            if "candidates" in result and len(result["candidates"]) > 0:
-                candidate = result["candidates"][0]
-                if "content" in candidate and "parts" in candidate["content"]:
-                    # Extract text from all parts
-                    text_parts = [part["text"] for part in candidate["content"]["parts"] if "text" in part]
-                    return "\n".join(text_parts)
-            
-            return "No response generated"
+            parts = []
+            async with self._client.stream(
+                "POST", stream_url, headers=headers,
+                content=_json_dumps(data), timeout=60.0
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.startswith("data: "):
+                        continue
+                    try:
+                        chunk = _json_loads(line[len("data: "):])
+                        candidate = chunk["candidates"][0]
+                        texts = [p["text"] for p in candidate["content"]["parts"]
+                                 if "text" in p]
+                    except (ValueError, LookupError):
+                        continue
+                    stop = False
+                    for text in texts:
+                        parts.append(text)
+                        if stream_callback(text):
+                            # Caller has what it needs; closing the stream
+                            # here skips decoding the remaining tokens
+                            stop = True
+                            break
+                    if stop:
+                        break
+
+            return "".join(parts) if parts else "No response generated"
+
+        response = await self._post_with_retry(
+            url,
+            headers=headers,
+            content=_json_dumps(data),
+            timeout=60.0
+        )
+
+        result = _json_loads(response.content)
+
+        # Parse the response to extract the generated text
+        if "candidates" in result and len(result["candidates"]) > 0:
+            candidate = result["candidates"][0]
+            if "content" in candidate and "parts" in candidate["content"]:
+                # Extract text from all parts
+                text_parts = [part["text"] for part in candidate["content"]["parts"] if "text" in part]
+                return "\n".join(text_parts)
+
+        return "No response generated"
     
     async def query_model(self,
                          prompt: str,
                          system_message: str = "",
                          model: str = None,
                          temperature: float = 0.0,
-                         max_tokens: int = 4000) -> str:
+                         max_tokens: int = 4000,
+                         stream_callback: Optional[Callable[[str], None]] = None,
+                         json_mode: bool = False) -> str:
         """
         Query the appropriate API based on the model.
-        
+
         Args:
             prompt: User prompt to send to the API
             system_message: System message for context
             model: Model to use
             temperature: Temperature parameter
             max_tokens: Maximum number of tokens in the response
-            
+            stream_callback: Optional per-delta callback; enables streaming
+
         Returns:
             API response text
         """
         if model is None:
             model = self.default_model
-        
-        provider = self._select_provider(model)
-        
-        if provider == "google":
-            return await self.query_google(
-                prompt=prompt,
-                system_message=system_message,
-                model=model,
-                temperature=temperature,
-                max_tokens=max_tokens
+
+        # Size the output budget against the model's context window up front
+        max_tokens = self._clamp_max_tokens(max_tokens, prompt, system_message, model)
+
+        # Deterministic requests can be served from the response cache;
+        # sampled (temperature > 0) responses are never cached
+        cache_key = None
+        semantic_tag = None
+        if self.response_cache is not None and temperature == 0.0:
+            cache_key = ResponseCache.make_key(
+                model, prompt, system_message, temperature, max_tokens
             )
-        else:  # default to OpenAI
-            return await self.query_openai(
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        # Second tier: near-duplicate prompts matched by embedding similarity
+        if self.semantic_cache is not None and temperature == 0.0:
+            semantic_tag = SemanticCache.make_tag(model, temperature)
+            cached = self.semantic_cache.get(prompt + system_message, semantic_tag)
+            if cached is not None:
+                return cached
+
+        # Two dict lookups route the call; unknown providers fall back to
+        # OpenAI, matching the old branch's default
+        query = getattr(
+            self, self._providers.get(self._select_provider(model), "query_openai")
+        )
+        # Transport-level retry/backoff lives in _post_with_retry; the
+        # semaphore caps how many calls are in flight across the instance
+        async with self._request_semaphore:
+            response = await query(
                 prompt=prompt,
                 system_message=system_message,
                 model=model,
                 temperature=temperature,
-                max_tokens=max_tokens
+                max_tokens=max_tokens,
+                stream_callback=stream_callback,
+                json_mode=json_mode
             )
+
+        if cache_key is not None:
+            self.response_cache.set(cache_key, response)
+        if semantic_tag is not None:
+            self.semantic_cache.set(prompt + system_message, semantic_tag, response)
+
+        return response
     
-    async def summarize_paper_chunk(self, 
-                                   chunk: str, 
+    def _build_chunk_prompt(self,
+                            chunk: str,
+                            metadata: Dict[str, Any],
+                            is_first_chunk: bool = False,
+                            is_last_chunk: bool = False) -> tuple:
+        """
+        Build the (system_message, prompt) pair for a chunk summarization.
+
+        Shared by the real-time path (summarize_paper_chunk) and the batch
+        path (summarize_paper_chunks_batch) so the two stay in sync.
+        """
+        hints = []
+        if is_first_chunk:
+            hints.append("This appears to be the beginning of the paper (likely includes abstract and introduction).")
+        if is_last_chunk:
+            hints.append("This appears to be the end of the paper (likely includes conclusion and references).")
+        position_hints = ("\n" + "\n".join(hints) + "\n") if hints else ""
+
+        prompt = _CHUNK_PROMPT_TEMPLATE.format(
+            title=metadata.get("title", "Unknown"),
+            chunk=chunk,
+            position_hints=position_hints
+        )
+
+        return _CHUNK_SYSTEM_PROMPT, prompt
+
+    async def summarize_paper_chunk(self,
+                                   chunk: str,
                                    metadata: Dict[str, Any],
                                    is_first_chunk: bool = False,
                                    is_last_chunk: bool = False,
                                    model: str = None) -> Dict[str, Any]:
         """
         Summarize a single chunk of a research paper.
-        
+
         Args:
             chunk: Text chunk from the paper
             metadata: Paper metadata
@@ -361,86 +1091,289 @@ class LLMInterface:
         Returns:
             Dictionary with summary information
         """
-        system_message = """You are ResearchPal, an expert research assistant specializing in scientific literature analysis. 
-        Your task is to analyze a chunk of text from a research paper and extract key information.
-        
-        Be precise, factual, and comprehensive. Focus on identifying:
-        1. Main concepts and contributions
-        2. Methodologies described
-        3. Results presented
-        4. Important mathematical formulations
-        5. Model architectures (if applicable)
-        
-        If this chunk appears to be from the introduction, provide more context about the paper's goals.
-        If this chunk appears to be from the methodology, focus on technical details.
-        If this chunk appears to be from the results section, focus on findings and evaluation.
-        If this chunk appears to be from the conclusion, summarize the paper's contributions.
-        
-        Extract any numerical results, key figures, tables, or important equations."""
-        
-        prompt = f"""Analyze the following chunk of text from a research paper titled "{metadata.get('title', 'Unknown')}":
-        
-        ```
-        {chunk}
-        ```
-        
-        First determine which section(s) of the paper this chunk belongs to.
-        
-        {'This appears to be the beginning of the paper (likely includes abstract and introduction).' if is_first_chunk else ''}
-        {'This appears to be the end of the paper (likely includes conclusion and references).' if is_last_chunk else ''}
-        
-        Provide a detailed analysis of this chunk with the following information:
-        
-        1. SECTION_IDENTIFICATION: Identify which section(s) of the paper this chunk belongs to
-        2. SUMMARY: Summarize the key information in this chunk (200-300 words)
-        3. KEY_FINDINGS: List up to 5 key findings or points from this chunk
-        4. TECHNICAL_DETAILS: Extract any important technical details, methodologies, or algorithms
-        5. MATH_FORMULATIONS: Extract any important mathematical formulations or equations
-        6. ARCHITECTURE_DETAILS: If a model architecture is described, provide details
-        7. RESULTS: Extract any experimental results or evaluations
-        
-        Format your response as a JSON object with these fields."""
-        
+        system_message, prompt = self._build_chunk_prompt(
+            chunk, metadata, is_first_chunk, is_last_chunk
+        )
+
         # Use the specified model or default
         if model is None:
             model = self.default_model
-        
+
         # Query the appropriate API
         response = await self.query_model(
             prompt=prompt,
             system_message=system_message,
             model=model,
-            temperature=0.0
+            temperature=0.0,
+            json_mode=True
         )
-        
-        # Extract JSON from the response
-        try:
-            # Find JSON in the response (in case there's text before/after)
-            json_start = response.find('{')
-            json_end = response.rfind('}') + 1
-            if json_start >= 0 and json_end > 0:
-                json_str = response[json_start:json_end]
-                summary_data = json.loads(json_str)
-            else:
-                # If no JSON brackets found, try to parse the whole response
-                summary_data = json.loads(response)
-                
+
+        # Extract JSON from the response (single-pass, brace-balanced)
+        summary_data = _extract_json(response)
+        if summary_data is not None:
             return summary_data
-            
-        except json.JSONDecodeError:
-            logger.error(f"Failed to parse JSON from response: {response}")
-            # Return a structured response even if JSON parsing fails
-            return {
-                "SECTION_IDENTIFICATION": "Unknown",
-                "SUMMARY": response[:500],  # First 500 chars as fallback
-                "KEY_FINDINGS": [],
-                "TECHNICAL_DETAILS": "",
-                "MATH_FORMULATIONS": "",
-                "ARCHITECTURE_DETAILS": "",
-                "RESULTS": ""
-            }
+
+        logger.error(f"Failed to parse JSON from response: {response}")
+        # Return a structured response even if JSON parsing fails
+        return {
+            "SECTION_IDENTIFICATION": "Unknown",
+            "SUMMARY": response[:500],  # First 500 chars as fallback
+            "KEY_FINDINGS": [],
+            "TECHNICAL_DETAILS": "",
+            "MATH_FORMULATIONS": "",
+            "ARCHITECTURE_DETAILS": "",
+            "RESULTS": ""
+        }
     
-    async def merge_chunk_summaries(self, 
+    async def summarize_paper_chunks(self,
+                                    chunks: List[str],
+                                    metadata: Dict[str, Any],
+                                    model: str = None) -> List[Dict[str, Any]]:
+        """
+        Summarize all chunks of a paper concurrently.
+
+        Dispatches one summarize_paper_chunk call per chunk under an
+        asyncio.Semaphore bound by self.max_concurrency, so a long paper is
+        processed in a few round-trip times instead of one per chunk.
+
+        Args:
+            chunks: Text chunks of the paper, in order
+            metadata: Paper metadata
+            model: Model to use for summarization
+
+        Returns:
+            List of chunk summary dictionaries, in chunk order
+        """
+        # Opt-in offline mode: trade latency for the Batch API's pricing
+        if os.environ.get(BATCH_MODE_ENV) and self._select_provider(model) == "openai":
+            return await self.summarize_paper_chunks_batch(chunks, metadata, model)
+
+        n = len(chunks)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def _summarize_one(i: int, chunk: str):
+            async with semaphore:
+                return await self.summarize_paper_chunk(
+                    chunk=chunk,
+                    metadata=metadata,
+                    is_first_chunk=(i == 0),
+                    is_last_chunk=(i == n - 1),
+                    model=model
+                )
+
+        # Coalesce identical chunks (repeated headers, boilerplate, reference
+        # pages) onto a single in-flight call: every position sharing a
+        # content hash awaits the same task. The first/last flags are part of
+        # the key since they change the prompt.
+        tasks: Dict[Any, asyncio.Task] = {}
+        keys = []
+        for i, chunk in enumerate(chunks):
+            key = (
+                hashlib.blake2b(chunk.encode(), digest_size=16).digest(),
+                i == 0,
+                i == n - 1
+            )
+            keys.append(key)
+            if key not in tasks:
+                tasks[key] = asyncio.ensure_future(_summarize_one(i, chunk))
+
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+        summaries = []
+        for i, key in enumerate(keys):
+            task = tasks[key]
+            exc = task.exception()
+            result = exc if exc is not None else task.result()
+            if isinstance(result, BaseException):
+                logger.error(f"Failed to summarize chunk {i}: {result}")
+                # Keep positions stable with the same fallback shape
+                # summarize_paper_chunk uses on parse failures
+                result = {
+                    "SECTION_IDENTIFICATION": "Unknown",
+                    "SUMMARY": "",
+                    "KEY_FINDINGS": [],
+                    "TECHNICAL_DETAILS": "",
+                    "MATH_FORMULATIONS": "",
+                    "ARCHITECTURE_DETAILS": "",
+                    "RESULTS": ""
+                }
+            summaries.append(result)
+
+        return summaries
+
+    async def submit_batch(self, jobs: List[Dict[str, Any]]) -> str:
+        """
+        Upload a list of Batch API jobs and create the batch job.
+
+        Args:
+            jobs: Request records ({custom_id, method, url, body}) as
+                accepted by the OpenAI Batch API
+
+        Returns:
+            The created batch id, for use with poll_batch.
+        """
+        if not self.openai_api_key:
+            raise ValueError("OpenAI API key not found")
+
+        headers = {"Authorization": f"Bearer {self.openai_api_key}"}
+
+        upload = await self._client.post(
+            "https://api.openai.com/v1/files",
+            headers=headers,
+            data={"purpose": "batch"},
+            files={"file": ("batch.jsonl", b"\n".join(_json_dumps(job) for job in jobs))}
+        )
+        upload.raise_for_status()
+        file_id = _json_loads(upload.content)["id"]
+
+        created = await self._client.post(
+            "https://api.openai.com/v1/batches",
+            headers=headers,
+            json={
+                "input_file_id": file_id,
+                "endpoint": "/v1/chat/completions",
+                "completion_window": "24h"
+            }
+        )
+        created.raise_for_status()
+        return _json_loads(created.content)["id"]
+
+    async def poll_batch(self,
+                        batch_id: str,
+                        poll_interval: float = 30.0,
+                        max_wait: float = 24 * 3600) -> Dict[str, str]:
+        """
+        Poll a batch until it settles and download its output.
+
+        Args:
+            batch_id: Batch id returned by submit_batch
+            poll_interval: Initial delay between status polls, in seconds
+            max_wait: Give up after this many seconds
+
+        Returns:
+            Mapping of custom_id to response message content for every
+            request that completed successfully.
+        """
+        headers = {"Authorization": f"Bearer {self.openai_api_key}"}
+
+        # Poll with a gently widening interval until the job settles
+        deadline = time.time() + max_wait
+        delay = poll_interval
+        batch = {"status": "validating", "id": batch_id}
+        while batch["status"] not in ("completed", "failed", "expired", "cancelled"):
+            if time.time() > deadline:
+                raise TimeoutError(f"Batch {batch_id} did not complete within {max_wait}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 1.5, 300.0)
+            status = await self._client.get(
+                f"https://api.openai.com/v1/batches/{batch_id}", headers=headers
+            )
+            status.raise_for_status()
+            batch = _json_loads(status.content)
+
+        if batch["status"] != "completed":
+            raise RuntimeError(f"Batch {batch_id} finished with status {batch['status']}")
+
+        output = await self._client.get(
+            f"https://api.openai.com/v1/files/{batch['output_file_id']}/content",
+            headers=headers
+        )
+        output.raise_for_status()
+
+        results: Dict[str, str] = {}
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            record = _json_loads(line)
+            try:
+                content = record["response"]["body"]["choices"][0]["message"]["content"]
+            except (KeyError, IndexError, TypeError):
+                continue
+            results[record["custom_id"]] = content
+        return results
+
+    async def summarize_paper_chunks_batch(self,
+                                          chunks: List[str],
+                                          metadata: Dict[str, Any],
+                                          model: str = None,
+                                          poll_interval: float = 30.0,
+                                          max_wait: float = 24 * 3600) -> List[Dict[str, Any]]:
+        """
+        Summarize chunks through the OpenAI Batch API.
+
+        Uploads one /v1/chat/completions request per chunk as a JSONL batch,
+        polls until completion and parses the output file. Batch pricing is
+        half the real-time rate with up to 24h turnaround - intended for
+        offline/nightly jobs, gated by RESEARCHPAL_BATCH_MODE.
+
+        Args:
+            chunks: Text chunks of the paper, in order
+            metadata: Paper metadata
+            model: OpenAI model to use
+            poll_interval: Initial delay between status polls, in seconds
+            max_wait: Give up after this many seconds
+
+        Returns:
+            List of chunk summary dictionaries, in chunk order
+        """
+        if not self.openai_api_key:
+            raise ValueError("OpenAI API key not found")
+
+        if model is None:
+            model = self.default_model
+
+        if self._select_provider(model) != "openai":
+            logger.warning(f"Model {model} is not an OpenAI model. Using gpt-4o-mini for batch.")
+            model = "gpt-4o-mini"
+
+        model_name = self._get_actual_model_name(model)
+
+        # One request per chunk, addressable by index via custom_id
+        n = len(chunks)
+        jobs = []
+        for i, chunk in enumerate(chunks):
+            system_message, prompt = self._build_chunk_prompt(
+                chunk, metadata, is_first_chunk=(i == 0), is_last_chunk=(i == n - 1)
+            )
+            jobs.append({
+                "custom_id": f"chunk-{i}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": model_name,
+                    "messages": [
+                        {"role": "system", "content": system_message},
+                        {"role": "user", "content": prompt}
+                    ],
+                    "temperature": 0.0,
+                    "max_tokens": 4000,
+                    "response_format": {"type": "json_object"}
+                }
+            })
+
+        batch_id = await self.submit_batch(jobs)
+        outputs = await self.poll_batch(batch_id, poll_interval=poll_interval, max_wait=max_wait)
+
+        # Map completed responses back into chunk order
+        by_index: Dict[int, Dict[str, Any]] = {}
+        for custom_id, content in outputs.items():
+            index = int(custom_id.rsplit("-", 1)[1])
+            parsed = _extract_json(content)
+            if parsed is not None:
+                by_index[index] = parsed
+
+        fallback = {
+            "SECTION_IDENTIFICATION": "Unknown",
+            "SUMMARY": "",
+            "KEY_FINDINGS": [],
+            "TECHNICAL_DETAILS": "",
+            "MATH_FORMULATIONS": "",
+            "ARCHITECTURE_DETAILS": "",
+            "RESULTS": ""
+        }
+        return [by_index.get(i, dict(fallback)) for i in range(n)]
+
+    async def merge_chunk_summaries(self,
                                summaries: List[Dict[str, Any]], 
                                metadata: Dict[str, Any],
                                model: str = None) -> Dict[str, Any]:
@@ -462,167 +1395,131 @@ class LLMInterface:
             elif isinstance(val, list):
                 return "\n".join([ensure_str(item) for item in val])
             elif isinstance(val, dict):
-                return json.dumps(val, indent=2)
+                return _json_dumps_indented(val)
             else:
                 return str(val)
         
-        # Combine all summaries
-        combined_summary = "\n\n".join([ensure_str(s.get("SUMMARY", "")) for s in summaries])
-        
-        # Collect all key findings
+        # Helper to collect a field into a bucket, handling all possible types;
+        # empty values are skipped at append time rather than filtered later
+        def collect(value, bucket):
+            if not value:
+                return
+            if isinstance(value, list):
+                bucket.extend([ensure_str(item) for item in value])
+            else:
+                bucket.append(ensure_str(value))
+
+        # Collect every field in a single pass over the summaries instead of
+        # one traversal (and one intermediate list) per field
+        summary_parts = []
         key_findings = []
-        for summary in summaries:
-            findings = summary.get("KEY_FINDINGS", [])
+        tech_details_list = []
+        math_formulations_list = []
+        architecture_details_list = []
+        results_list = []
+
+        for s in summaries:
+            summary_parts.append(ensure_str(s.get("SUMMARY", "")))
+            findings = s.get("KEY_FINDINGS", [])
             if isinstance(findings, list):
                 key_findings.extend([ensure_str(item) for item in findings])
             else:
                 key_findings.append(ensure_str(findings))
-        
-        # Collect technical details - handle all possible types
-        tech_details_list = []
-        for s in summaries:
-            if s.get("TECHNICAL_DETAILS"):
-                tech_detail = s.get("TECHNICAL_DETAILS")
-                if isinstance(tech_detail, list):
-                    tech_details_list.extend([ensure_str(item) for item in tech_detail])
-                else:
-                    tech_details_list.append(ensure_str(tech_detail))
+            collect(s.get("TECHNICAL_DETAILS"), tech_details_list)
+            collect(s.get("MATH_FORMULATIONS"), math_formulations_list)
+            collect(s.get("ARCHITECTURE_DETAILS"), architecture_details_list)
+            collect(s.get("RESULTS"), results_list)
+
+        combined_summary = "\n\n".join(summary_parts)
         tech_details = "\n\n".join(tech_details_list)
-        
-        # Collect math formulations - handle all possible types
-        math_formulations_list = []
-        for s in summaries:
-            if s.get("MATH_FORMULATIONS"):
-                math_formulation = s.get("MATH_FORMULATIONS")
-                if isinstance(math_formulation, list):
-                    math_formulations_list.extend([ensure_str(item) for item in math_formulation])
-                else:
-                    math_formulations_list.append(ensure_str(math_formulation))
         math_formulations = "\n\n".join(math_formulations_list)
-        
-        # Collect architecture details - handle all possible types
-        architecture_details_list = []
-        for s in summaries:
-            if s.get("ARCHITECTURE_DETAILS"):
-                arch_detail = s.get("ARCHITECTURE_DETAILS")
-                if isinstance(arch_detail, list):
-                    architecture_details_list.extend([ensure_str(item) for item in arch_detail])
-                else:
-                    architecture_details_list.append(ensure_str(arch_detail))
         architecture_details = "\n\n".join(architecture_details_list)
-        
-        # Collect results - handle all possible types
-        results_list = []
-        for s in summaries:
-            if s.get("RESULTS"):
-                result = s.get("RESULTS")
-                if isinstance(result, list):
-                    results_list.extend([ensure_str(item) for item in result])
-                else:
-                    results_list.append(ensure_str(result))
         results = "\n\n".join(results_list)
         
         # Now generate a comprehensive summary using another LLM call
-        system_message = """You are ResearchPal, an expert research assistant specializing in scientific literature analysis.
-        Your task is to create a comprehensive, well-structured summary of a research paper based on section summaries.
-        
-        Be precise, factual, and comprehensive. Organize the information logically.
-        Focus on presenting the paper's contributions, methodologies, results, and implications.
-        
-        Your summary should be suitable for a researcher who wants to understand the paper without reading it entirely."""
-        
-        title = metadata.get("title", "Unknown Paper")
-        authors = metadata.get("author", "")
-        
-        prompt = f"""Create a comprehensive summary of the research paper titled "{title}" by {authors}.
-        
-        I'll provide you with summaries from different sections of the paper. Please synthesize this information into a cohesive, well-structured summary of the entire paper.
-        
-        Here are the section summaries:
-        
-        {combined_summary}
-        
-        Here are the key findings identified across the paper:
-        {json.dumps(key_findings, indent=2)}
-        
-        Technical details and methodologies:
-        {tech_details}
-        
-        Mathematical formulations:
-        {math_formulations}
-        
-        Architecture details (if applicable):
-        {architecture_details}
-        
-        Results and evaluations:
-        {results}
-        
-        Please provide a comprehensive summary with the following sections:
-        1. OVERVIEW: A brief overview of the paper (100-150 words)
-        2. PROBLEM_STATEMENT: The problem addressed by the paper
-        3. METHODOLOGY: The approach and methods used
-        4. ARCHITECTURE: Detailed architecture description (if applicable)
-        5. KEY_RESULTS: The main results and findings
-        6. IMPLICATIONS: Implications and importance of the work
-        7. TAKEAWAYS: Major takeaways (in bullet points)
-        8. FUTURE_DIRECTIONS: Potential future research directions mentioned or implied
-        9. BACKGROUND: Important background information
-        10. MATH_FORMULATIONS: Important mathematical formulations (if applicable)
-        
-        Format your response as a JSON object with these fields."""
-        
+        system_message = _MERGE_SYSTEM_PROMPT
+
+        prompt = _MERGE_PROMPT_TEMPLATE.format(
+            title=metadata.get("title", "Unknown Paper"),
+            authors=metadata.get("author", ""),
+            combined_summary=combined_summary,
+            key_findings=_json_dumps_indented(key_findings),
+            tech_details=tech_details,
+            math_formulations=math_formulations,
+            architecture_details=architecture_details,
+            results=results
+        )
+
         # Use the specified model or default
         if model is None:
             model = self.default_model
-        
+
+        # If the assembled prompt would overflow the context window, merge
+        # hierarchically: fold every _MERGE_FANOUT summaries into a
+        # super-summary, then merge the super-summaries (tree reduce)
+        model_info = self.get_model_info(model)
+        input_tokens = _count_tokens(prompt, model) + _count_tokens(system_message, model)
+        if (len(summaries) > _MERGE_FANOUT
+                and input_tokens + 4000 > model_info.get("max_tokens", 128000)):
+            groups = [summaries[i:i + _MERGE_FANOUT]
+                      for i in range(0, len(summaries), _MERGE_FANOUT)]
+            merged_groups = await asyncio.gather(
+                *(self.merge_chunk_summaries(group, metadata, model) for group in groups)
+            )
+            # Map each merged group back into the chunk-summary shape so the
+            # final pass can reuse the same merge path
+            super_summaries = [
+                {
+                    "SUMMARY": m.get("OVERVIEW", ""),
+                    "KEY_FINDINGS": m.get("TAKEAWAYS", []),
+                    "TECHNICAL_DETAILS": m.get("METHODOLOGY", ""),
+                    "MATH_FORMULATIONS": m.get("MATH_FORMULATIONS", ""),
+                    "ARCHITECTURE_DETAILS": m.get("ARCHITECTURE", ""),
+                    "RESULTS": m.get("KEY_RESULTS", "")
+                }
+                for m in merged_groups
+            ]
+            return await self.merge_chunk_summaries(super_summaries, metadata, model)
+
         # Use appropriate API to generate comprehensive summary
         response = await self.query_model(
             prompt=prompt,
             system_message=system_message,
             model=model,
             temperature=0.2,
-            max_tokens=4000
+            max_tokens=4000,
+            json_mode=True
         )
-        
-        # Extract JSON from the response
-        try:
-            # Find JSON in the response (in case there's text before/after)
-            json_start = response.find('{')
-            json_end = response.rfind('}') + 1
-            if json_start >= 0 and json_end > 0:
-                json_str = response[json_start:json_end]
-                full_summary = json.loads(json_str)
-            else:
-                # If no JSON brackets found, try to parse the whole response
-                full_summary = json.loads(response)
-            
+
+        # Extract JSON from the response (single-pass, brace-balanced)
+        full_summary = _extract_json(response)
+        if full_summary is not None:
             # Ensure all expected fields are present
             expected_fields = [
                 "OVERVIEW", "PROBLEM_STATEMENT", "METHODOLOGY", "ARCHITECTURE", "KEY_RESULTS",
                 "IMPLICATIONS", "TAKEAWAYS", "FUTURE_DIRECTIONS", "BACKGROUND", "MATH_FORMULATIONS"
             ]
-            
+
             for field in expected_fields:
                 if field not in full_summary:
                     full_summary[field] = ""
-            
+
             return full_summary
-            
-        except json.JSONDecodeError:
-            logger.error(f"Failed to parse JSON from response: {response}")
-            # Return a structured response even if JSON parsing fails
-            return {
-                "OVERVIEW": response[:500],  # First 500 chars as fallback
-                "PROBLEM_STATEMENT": "",
-                "METHODOLOGY": "",
-                "ARCHITECTURE": "",
-                "KEY_RESULTS": "",
-                "IMPLICATIONS": "",
-                "TAKEAWAYS": [],
-                "FUTURE_DIRECTIONS": [],
-                "BACKGROUND": "",
-                "MATH_FORMULATIONS": ""
-            }
+
+        logger.error(f"Failed to parse JSON from response: {response}")
+        # Return a structured response even if JSON parsing fails
+        return {
+            "OVERVIEW": response[:500],  # First 500 chars as fallback
+            "PROBLEM_STATEMENT": "",
+            "METHODOLOGY": "",
+            "ARCHITECTURE": "",
+            "KEY_RESULTS": "",
+            "IMPLICATIONS": "",
+            "TAKEAWAYS": [],
+            "FUTURE_DIRECTIONS": [],
+            "BACKGROUND": "",
+            "MATH_FORMULATIONS": ""
+        }
     
     async def generate_comprehensive_analysis(self,
                                              paper_summary: Dict[str, Any],
@@ -641,9 +1538,6 @@ class LLMInterface:
         Returns:
             Dictionary with comprehensive analysis sections
         """
-        # Import the prompt here to avoid circular imports
-        from research_pal.core.prompts import COMPREHENSIVE_ANALYSIS_PROMPT
-        
         system_message = COMPREHENSIVE_ANALYSIS_PROMPT
         
         # Create a concise representation of the paper
@@ -653,24 +1547,14 @@ class LLMInterface:
         results = paper_summary.get("KEY_RESULTS", "") or paper_summary.get("key_results", "")
         implications = paper_summary.get("IMPLICATIONS", "") or paper_summary.get("implications", "")
         
-        prompt = f"""Generate a comprehensive analysis of the paper titled "{paper_title}" based on the following summary:
-        
-        Overview:
-        {overview}
-        
-        Problem Statement:
-        {problem}
-        
-        Methodology:
-        {methodology}
-        
-        Key Results:
-        {results}
-        
-        Implications:
-        {implications}
-        
-        Please provide the analysis in the requested format with TAKEAWAYS, IMPORTANT_IDEAS, FUTURE_IDEAS, NOVELTY, LIMITATIONS, PRACTICAL_APPLICATIONS, and RELATED_WORK sections."""
+        prompt = _ANALYSIS_PROMPT_TEMPLATE.format(
+            paper_title=paper_title,
+            overview=overview,
+            problem=problem,
+            methodology=methodology,
+            results=results,
+            implications=implications
+        )
         
         # Use the specified model or default
         if model is None:
@@ -682,35 +1566,26 @@ class LLMInterface:
             system_message=system_message,
             model=model,
             temperature=0.3,
-            max_tokens=max_tokens
+            max_tokens=max_tokens,
+            json_mode=True
         )
-        
-        # Extract JSON from the response
-        try:
-            # Find JSON in the response (in case there's text before/after)
-            json_start = response.find('{')
-            json_end = response.rfind('}') + 1
-            if json_start >= 0 and json_end > 0:
-                json_str = response[json_start:json_end]
-                analysis_data = json.loads(json_str)
-            else:
-                # If no JSON brackets found, try to parse the whole response
-                analysis_data = json.loads(response)
-            
+
+        # Extract JSON from the response (single-pass, brace-balanced)
+        analysis_data = _extract_json(response)
+        if analysis_data is not None:
             return analysis_data
-            
-        except json.JSONDecodeError:
-            logger.error(f"Failed to parse JSON from response: {response}")
-            # Return a structured response even if JSON parsing fails
-            return {
-                "TAKEAWAYS": [],
-                "IMPORTANT_IDEAS": [],
-                "FUTURE_IDEAS": [],
-                "NOVELTY": "",
-                "LIMITATIONS": [],
-                "PRACTICAL_APPLICATIONS": [],
-                "RELATED_WORK": ""
-            }
+
+        logger.error(f"Failed to parse JSON from response: {response}")
+        # Return a structured response even if JSON parsing fails
+        return {
+            "TAKEAWAYS": [],
+            "IMPORTANT_IDEAS": [],
+            "FUTURE_IDEAS": [],
+            "NOVELTY": "",
+            "LIMITATIONS": [],
+            "PRACTICAL_APPLICATIONS": [],
+            "RELATED_WORK": ""
+        }
     
     async def generate_code_implementation(self, 
                                          architecture_details: str, 
@@ -727,33 +1602,12 @@ class LLMInterface:
         Returns:
             Python code implementing the architecture
         """
-        system_message = """You are ResearchPal, an expert in implementing machine learning and deep learning architectures from research papers.
-        Your task is to generate clean, working Python code that implements the architecture described in a research paper.
-        
-        Use PyTorch as the default framework unless otherwise specified.
-        Include comprehensive comments explaining each part of the implementation.
-        Follow best practices for code organization and structure.
-        Make reasonable assumptions when details are unclear, and document these assumptions in comments."""
-        
-        prompt = f"""Generate a Python implementation of the model architecture described in the paper titled "{paper_title}".
-        
-        Here is the description of the architecture:
-        
-        ```
-        {architecture_details}
-        ```
-        
-        Please provide a complete, working implementation that includes:
-        
-        1. All necessary imports
-        2. The model class(es) definition
-        3. Any helper functions or utility classes needed
-        4. Example usage showing how to instantiate and use the model
-        5. Comprehensive comments explaining the implementation
-        
-        Make reasonable assumptions if some details are not provided, and document these assumptions in comments.
-        
-        The code should follow best practices and be ready to use with minimal modifications."""
+        system_message = _CODE_SYSTEM_PROMPT
+
+        prompt = _CODE_PROMPT_TEMPLATE.format(
+            paper_title=paper_title,
+            architecture_details=architecture_details
+        )
         
         # For code generation, we'll prefer Gemini Flash 2.0 which is good for coding tasks
         response = await self.query_model(
@@ -764,10 +1618,19 @@ class LLMInterface:
             max_tokens=8000
         )
         
-        # Extract code from the response (in case there's text before/after code blocks)
-        code_pattern = r"```python(.*?)```"
-        code_blocks = re.findall(code_pattern, response, re.DOTALL)
-        
+        # Extract code from the response (in case there's text before/after
+        # code blocks). Single-block responses - the common case - are sliced
+        # directly; the compiled regex only runs when several blocks must be
+        # concatenated.
+        start = response.find("```python")
+        if start >= 0:
+            body_start = start + len("```python")
+            end = response.find("```", body_start)
+            if end >= 0 and "```python" not in response[end + 3:]:
+                return response[body_start:end].strip()
+
+        code_blocks = _PY_CODE_RE.findall(response)
+
         if code_blocks:
             # Combine all code blocks
             full_code = "\n\n".join([block.strip() for block in code_blocks])
@@ -776,125 +1639,130 @@ class LLMInterface:
             # If no code blocks found, return the entire response
             return response
     
-    async def generate_similar_papers(self, 
+    def _build_similar_papers_prompt(self,
+                                     paper_summary: Dict[str, Any],
+                                     paper_title: str) -> tuple:
+        """Build the (system_message, prompt) pair for paper recommendations."""
+        # Create a concise representation of the paper; the template itself
+        # is a module constant so each call only pays for the fill-in.
+        # Fields are capped to the token budget - a few hundred tokens of
+        # each section is plenty for recommendations, and some papers would
+        # otherwise inject thousands of tokens of prefill per field
+        budget = self.summary_token_budget
+        prompt = _SIMILAR_PAPERS_TEMPLATE.format_map({
+            "title": paper_title,
+            "overview": _truncate_tokens(
+                paper_summary.get("OVERVIEW", "") or paper_summary.get("summary", ""),
+                budget),
+            "problem": _truncate_tokens(
+                paper_summary.get("PROBLEM_STATEMENT", "") or paper_summary.get("problem_statement", ""),
+                budget),
+            "methodology": _truncate_tokens(
+                paper_summary.get("METHODOLOGY", "") or paper_summary.get("methodology", ""),
+                budget),
+        })
+
+        return _SIMILAR_SYSTEM_PROMPT, prompt
+
+    @staticmethod
+    def _parse_recommendations(response: str) -> List[Dict[str, str]]:
+        """Parse a recommendations response into a list (with error fallback)."""
+        # Large payloads: simdjson materializes only the recommendations
+        # array instead of building the full tree
+        if _SIMD_PARSER is not None and len(response) > _SIMD_MIN_BYTES:
+            try:
+                doc = _SIMD_PARSER.parse(response.encode())
+                if hasattr(doc, "keys"):
+                    doc = doc["recommendations"]
+                return doc.as_list()
+            except (ValueError, KeyError, AttributeError):
+                pass  # not bare JSON (or no array); use the paths below
+
+        # Fast path: the response is often the bare JSON array, which orjson
+        # decodes directly without any bracket scanning
+        try:
+            recommendations = _json_loads(response)
+        except (ValueError, TypeError):
+            # Fall back to the one-pass extractor, which pulls the first
+            # balanced JSON value out of surrounding prose
+            recommendations = _extract_json(response)
+
+        # If it's an object with a recommendations field, use that
+        if isinstance(recommendations, dict):
+            recommendations = recommendations.get("recommendations", recommendations)
+
+        if isinstance(recommendations, list):
+            return recommendations
+
+        logger.error(f"Failed to parse JSON from response: {response[:500]}...")
+        # Return a structured response even if JSON parsing fails
+        return [
+            {
+                "title": "Error parsing recommendations",
+                "authors": "N/A",
+                "year": "",
+                "relevance": "Failed to generate proper recommendations"
+            }
+        ]
+
+    async def generate_similar_papers(self,
                                      paper_summary: Dict[str, Any],
                                      paper_title: str,
                                      model: str = None) -> List[Dict[str, str]]:
         """
         Generate recommendations for similar papers.
-        
+
         Args:
             paper_summary: Dictionary containing paper summary
             paper_title: Title of the paper
             model: Model to use for recommendations
-            
+
         Returns:
             List of similar paper recommendations
         """
-        system_message = """You are ResearchPal, an expert research assistant with extensive knowledge of scientific literature.
-        Your task is to recommend similar papers based on the summary of a given paper.
-        
-        Provide recommendations that are relevant, diverse, and high-quality.
-        Include both seminal works and recent advances in the field.
-        For each recommendation, provide the title, authors, year, and a brief explanation of its relevance."""
-        
-        # Create a concise representation of the paper
-        overview = paper_summary.get("OVERVIEW", "") or paper_summary.get("summary", "")
-        problem = paper_summary.get("PROBLEM_STATEMENT", "") or paper_summary.get("problem_statement", "")
-        methodology = paper_summary.get("METHODOLOGY", "") or paper_summary.get("methodology", "")
-        
-        prompt = f"""Based on the following summary of the paper titled "{paper_title}", recommend 5 similar papers that would be relevant to someone interested in this research.
-        
-        Paper Overview:
-        {overview}
-        
-        Problem Statement:
-        {problem}
-        
-        Methodology:
-        {methodology}
-        
-        Please recommend 5 papers that are:
-        1. Closely related to this research topic
-        2. A mix of foundational papers and recent advances
-        3. Diverse in their approaches to the problem
-        
-        For each recommendation, provide:
-        - Title
-        - Authors
-        - Year of publication (approximate if unsure)
-        - A brief explanation of why it's relevant to someone interested in the original paper
-        
-        Format your response as a JSON array of objects with these fields."""
-        
+        system_message, prompt = self._build_similar_papers_prompt(
+            paper_summary, paper_title
+        )
+
         # Use the specified model or default
         if model is None:
             model = self.default_model
-        
-        # Use appropriate API to generate similar paper recommendations
+
+        # Same-topic papers produce near-identical prompts that miss the
+        # exact-hash cache; the embedding-similarity tier catches them and
+        # returns the prior recommendations without an LLM round trip.
+        # (query_model's own semantic lookup only covers temperature 0.)
+        cache_tag = None
+        if self.semantic_cache is not None:
+            cache_tag = f"similar:{model}"
+            cached = self.semantic_cache.get(prompt, cache_tag)
+            if cached is not None:
+                parsed = _extract_json(cached)
+                if isinstance(parsed, list):
+                    return parsed
+
+        # Stream the response and stop as soon as the recommendations array
+        # closes: models often trail the JSON with prose, and cutting the
+        # stream there saves that decode time on every call
+        tracker = _JsonCompletionTracker()
         response = await self.query_model(
             prompt=prompt,
             system_message=system_message,
             model=model,
-            temperature=0.3
+            temperature=0.3,
+            stream_callback=tracker.feed
         )
-    
-        # Improve the try/except block for JSON parsing
-        try:
-            # Find JSON in the response (in case there's text before/after)
-            json_start = response.find('[')
-            json_end = response.rfind(']') + 1
-            
-            if json_start >= 0 and json_end > 0:
-                json_str = response[json_start:json_end]
-                
-                # Add safety checks and cleanup before parsing
-                try:
-                    recommendations = json.loads(json_str)
-                except json.JSONDecodeError:
-                    # Attempt to clean the JSON string
-                    logger.warning("Initial JSON parsing failed, attempting to clean the response")
-                    
-                    # Simplify overly long author entries (likely hallucinations)
-                    import re
-                    cleaned_json = re.sub(r'\["([^"]+?)"(?:, "R\.)+', '["\\1"', json_str)
-                    cleaned_json = re.sub(r'(R\. ){10,}', 'Various Authors', cleaned_json)
-                    
-                    # Try parsing again with the cleaned JSON
-                    try:
-                        recommendations = json.loads(cleaned_json)
-                    except json.JSONDecodeError:
-                        # If all else fails, return a simplified fallback
-                        logger.error(f"Failed to parse JSON even after cleaning: {json_str[:500]}...")
-                        return [
-                            {
-                                "title": "Error parsing recommendations",
-                                "authors": "N/A",
-                                "year": "",
-                                "relevance": "Failed to generate proper recommendations"
-                            }
-                        ]
-            else:
-                # If no JSON array found, try to parse as a JSON object
-                recommendations = json.loads(response)
-                # If it's an object with a recommendations field, use that
-                if isinstance(recommendations, dict) and "recommendations" in recommendations:
-                    recommendations = recommendations.get("recommendations", [])
-                
-            return recommendations
-                
-        except Exception as e:
-            logger.error(f"Failed to parse JSON from response: {response[:500]}...")
-            # Return a structured response even if JSON parsing fails
-            return [
-                {
-                    "title": "Error parsing recommendations",
-                    "authors": "N/A",
-                    "year": "",
-                    "relevance": "Failed to generate proper recommendations. Error: " + str(e)
-                }
-            ]
-    
+
+        recommendations = self._parse_recommendations(response)
+
+        if (cache_tag is not None and recommendations
+                and recommendations[0].get("title") != "Error parsing recommendations"):
+            self.semantic_cache.set(
+                prompt, cache_tag, _json_dumps(recommendations).decode()
+            )
+
+        return recommendations
+
     async def generate_blog_post(self,
                                paper_summary: Dict[str, Any],
                                paper_title: str,
@@ -912,14 +1780,130 @@ class LLMInterface:
         Returns:
             Formatted blog post
         """
-        system_message = """You are ResearchPal, an expert in communicating complex research in an accessible way.
-        Your task is to generate a well-structured, engaging blog post about a research paper that balances technical accuracy with readability.
-        
-        The blog post should:
-        1. Have an engaging title and introduction
-        2. Explain the paper's significance and context
-        3. Break down complex concepts using analogies when helpful
-        4. Include section headings for better readability
-        5. End with implications and takeaways
-        
-        Adapt your writing style to match the sample provided, if available."""
\ No newline at end of file
+        system_message = _BLOG_SYSTEM_PROMPT
+
+        # Create a concise representation of the paper
+        prompt = _BLOG_PROMPT_TEMPLATE.format(
+            paper_title=paper_title,
+            overview=paper_summary.get("OVERVIEW", "") or paper_summary.get("summary", ""),
+            problem=paper_summary.get("PROBLEM_STATEMENT", "") or paper_summary.get("problem_statement", ""),
+            methodology=paper_summary.get("METHODOLOGY", "") or paper_summary.get("methodology", ""),
+            results=paper_summary.get("KEY_RESULTS", "") or paper_summary.get("key_results", ""),
+            implications=paper_summary.get("IMPLICATIONS", "") or paper_summary.get("implications", "")
+        )
+
+        if blog_style_sample:
+            prompt += (
+                "\n\nHere is a sample of my writing style - match its tone "
+                f"and voice:\n\n{blog_style_sample}"
+            )
+
+        # Use the specified model or default
+        if model is None:
+            model = self.default_model
+
+        return await self.query_model(
+            prompt=prompt,
+            system_message=system_message,
+            model=model,
+            temperature=0.7,
+            max_tokens=8000
+        )
+
+    async def generate_similar_papers_bulk(self,
+                                          papers: List[tuple],
+                                          model: str = None,
+                                          max_concurrency: int = None,
+                                          use_batch: bool = False) -> List[Any]:
+        """
+        Generate recommendations for many papers concurrently.
+
+        LLM calls are network-bound, so fanning out under a semaphore turns
+        N sequential round trips into roughly one. The semaphore keeps the
+        fan-out inside provider rate limits.
+
+        Args:
+            papers: (paper_summary, paper_title) tuples
+            model: Model to use for recommendations
+            max_concurrency: In-flight request cap (defaults to
+                self.max_concurrency)
+            use_batch: Route through the OpenAI Batch API instead of
+                real-time requests (half cost, up to 24h turnaround) -
+                for latency-tolerant library-wide jobs
+
+        Returns:
+            One recommendation list per paper, in input order; failed papers
+            yield their exception instead.
+        """
+        if use_batch and self._select_provider(model) == "openai":
+            model_name = self._get_actual_model_name(model or self.default_model)
+            jobs = []
+            for i, (paper_summary, paper_title) in enumerate(papers):
+                system_message, prompt = self._build_similar_papers_prompt(
+                    paper_summary, paper_title
+                )
+                jobs.append({
+                    "custom_id": f"paper-{i}",
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": model_name,
+                        "messages": [
+                            {"role": "system", "content": system_message},
+                            {"role": "user", "content": prompt}
+                        ],
+                        "temperature": 0.3,
+                        "max_tokens": 4000
+                    }
+                })
+
+            batch_id = await self.submit_batch(jobs)
+            outputs = await self.poll_batch(batch_id)
+            return [
+                self._parse_recommendations(outputs[f"paper-{i}"])
+                if f"paper-{i}" in outputs else []
+                for i in range(len(papers))
+            ]
+
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+
+        async def _one(paper_summary, paper_title):
+            async with semaphore:
+                return await self.generate_similar_papers(paper_summary, paper_title, model)
+
+        return await asyncio.gather(
+            *(_one(summary, title) for summary, title in papers),
+            return_exceptions=True
+        )
+
+    async def generate_blog_posts_bulk(self,
+                                      papers: List[tuple],
+                                      blog_style_sample: str = "",
+                                      model: str = None,
+                                      max_concurrency: int = None) -> List[Any]:
+        """
+        Generate blog posts for many papers concurrently.
+
+        Args:
+            papers: (paper_summary, paper_title) tuples
+            blog_style_sample: Optional sample of user's blog writing style
+            model: Model to use for blog generation
+            max_concurrency: In-flight request cap (defaults to
+                self.max_concurrency)
+
+        Returns:
+            One blog post per paper, in input order; failed papers yield
+            their exception instead.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+
+        async def _one(paper_summary, paper_title):
+            async with semaphore:
+                return await self.generate_blog_post(
+                    paper_summary, paper_title, blog_style_sample, model
+                )
+
+        return await asyncio.gather(
+            *(_one(summary, title) for summary, title in papers),
+            return_exceptions=True
+        )
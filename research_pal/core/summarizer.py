@@ -13,6 +13,42 @@ from ..db.chroma_manager import ChromaManager
 
 logger = logging.getLogger(__name__)
 
+# Env overrides for chunk fan-out throttling: maximum concurrent chunk
+# summaries, and an optional requests-per-minute cap for strict provider
+# rate tiers
+MAX_CONCURRENCY_ENV = "RESEARCHPAL_MAX_CONCURRENCY"
+RPM_ENV = "RESEARCHPAL_RPM"
+
+# Paper-ID normalization regexes, compiled once instead of per call
+_SPECIAL_CHARS_RE = re.compile(r'[^\w\s]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Minimum chunk count before the Batch API's job turnaround beats the
+# online path; below this the per-call savings don't cover the polling
+_BATCH_API_MIN_CHUNKS = 50
+
+class _AsyncRateLimiter:
+    """
+    Token-bucket limiter spacing acquisitions to a requests-per-minute rate.
+
+    Each acquire() reserves the next free slot and sleeps until it arrives,
+    so bursts are smoothed instead of fired at once and retried after 429s.
+    """
+
+    def __init__(self, rpm: float):
+        self._interval = 60.0 / rpm
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            now = loop.time()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
 class PaperSummarizer:
     """Manages the process of summarizing research papers."""
     
@@ -40,6 +76,14 @@ class PaperSummarizer:
         self.llm_interface = llm_interface or LLMInterface()
         self.db_manager = db_manager or ChromaManager()
         self.output_token_limit = output_token_limit
+
+        # Throttle the chunk fan-out: submitting a 40-page paper's chunks
+        # all at once trips provider rate limits and wastes retries. Only
+        # the cap lives on the instance - the semaphore itself is created
+        # per run, since asyncio primitives bind to one event loop
+        self._max_chunk_concurrency = int(os.environ.get(MAX_CONCURRENCY_ENV, 16))
+        rpm = os.environ.get(RPM_ENV)
+        self._rate_limiter = _AsyncRateLimiter(float(rpm)) if rpm else None
     
     # Add this helper function near the top of the file
     def ensure_string(value):
@@ -53,6 +97,29 @@ class PaperSummarizer:
         else:
             return str(value)  # Convert to string if not already
     
+    @staticmethod
+    def _file_content_hash(filepath: str) -> str:
+        """Hash a file's bytes in 1 MiB blocks (content identity for dedup)."""
+        hasher = hashlib.blake2b(digest_size=16)
+        with open(filepath, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                hasher.update(block)
+        return hasher.hexdigest()
+
+    @staticmethod
+    def _fast_fingerprint(filepath: str) -> str:
+        """
+        Cheap file fingerprint: size plus a hash of the first 1 MiB.
+
+        Disambiguates duplicates in microseconds without reading the whole
+        file; the full content hash stays authoritative. mtime is left out
+        so copied/moved files still fingerprint identically.
+        """
+        head = hashlib.blake2b(digest_size=8)
+        with open(filepath, "rb") as f:
+            head.update(f.read(1 << 20))
+        return f"{os.path.getsize(filepath)}:{head.hexdigest()}"
+
     def _generate_paper_id(self, filepath: str, title: str) -> str:
         """
         Generate a unique ID for a paper based on filepath and title.
@@ -73,14 +140,12 @@ class PaperSummarizer:
         combined = f"{filename}_{title}"
         
         # Remove special characters and normalize spaces
-        combined = re.sub(r'[^\w\s]', '', combined)
-        combined = re.sub(r'\s+', '_', str(combined).strip()).lower()
-        
-        # Create a hash of the combined string
-        hash_obj = hashlib.md5(combined.encode())
-        paper_id = hash_obj.hexdigest()[:10]
-        
-        return paper_id
+        combined = _SPECIAL_CHARS_RE.sub('', combined)
+        combined = _WHITESPACE_RE.sub('_', str(combined).strip()).lower()
+
+        # blake2b at a 5-byte digest gives the same 10-hex-char id width
+        # as the old truncated md5, at a fraction of the hashing cost
+        return hashlib.blake2b(combined.encode(), digest_size=5).hexdigest()
     
     async def determine_paper_domain(self, 
                                     title: str, 
@@ -153,59 +218,91 @@ class PaperSummarizer:
             Paper ID if found, None otherwise
         """
         try:
-            # Normalize the filepath to handle path variations
-            normalized_path = os.path.abspath(os.path.expanduser(filepath))
-            
-            # A more robust approach would be to add a unique index on filepaths in the DB,
-            # but for now, we'll query all papers and check manually
-            filename = os.path.basename(normalized_path)
-            
-            # Search for papers with the same filename (not perfect but a start)
-            papers = self.search_papers(filename, n_results=20)
-            
-            for paper in papers:
-                # Get the stored filepath and normalize it too
-                paper_path = paper.get("filepath", "")
-                if paper_path:
-                    paper_path = os.path.abspath(os.path.expanduser(paper_path))
-                    
-                    # Check if paths match
-                    if paper_path == normalized_path:
-                        return paper.get("paper_id")
-                    
-                    # Also check if filenames match exactly (as a fallback)
-                    if os.path.basename(paper_path) == os.path.basename(normalized_path):
-                        # Check if the titles are similar (use fuzzy matching if available)
-                        paper_title = paper.get("title", "")
-                        
-                        # For now, just a simple check
-                        if paper_title and len(paper_title) > 5:
-                            # Get metadata from the file to check title
-                            extracted_data = self.pdf_processor.extract_and_chunk(normalized_path)
-                            metadata = extracted_data.get("metadata", {})
-                            title = metadata.get("title", "")
-                            
-                            # Simple similarity check
-                            if title and paper_title in title or title in paper_title:
-                                return paper.get("paper_id")
-            
-            # Not found
-            return None
-        
+            # Stored filepaths are normalized at add time, so a single
+            # metadata lookup answers this - no vector query, no PDF
+            # re-extraction
+            return self.db_manager.get_by_filepath(filepath)
         except Exception as e:
             logger.error(f"Error checking if paper exists: {e}")
             return None
     
-    async def summarize_paper(self, 
-                             filepath: str, 
+    async def _summarize_chunks_online(self,
+                                       chunks: List[str],
+                                       metadata: Dict[str, Any],
+                                       model: Optional[str]) -> List[Dict[str, Any]]:
+        """
+        Summarize chunks through per-call online requests.
+
+        Calls run in parallel, bounded by the semaphore (and the optional
+        RPM bucket) so huge papers submit as a sliding window rather than
+        one burst.
+        """
+        chunk_semaphore = asyncio.Semaphore(self._max_chunk_concurrency)
+
+        async def _summarize_chunk(i: int, chunk: str):
+            async with chunk_semaphore:
+                if self._rate_limiter is not None:
+                    await self._rate_limiter.acquire()
+                return await self.llm_interface.summarize_paper_chunk(
+                    chunk=chunk,
+                    metadata=metadata,
+                    is_first_chunk=(i == 0),
+                    is_last_chunk=(i == len(chunks) - 1),
+                    model=model
+                )
+
+        # Repeated boilerplate (headers/footers the chunker sometimes
+        # yields as identical chunks) is summarized once; duplicates map
+        # back to the shared result instead of paying another LLM call
+        seen: Dict[str, int] = {}
+        indirect: List[int] = []
+        unique_chunks: List[tuple] = []
+        for i, chunk in enumerate(chunks):
+            digest = hashlib.blake2b(chunk.encode(), digest_size=16).hexdigest()
+            if digest in seen:
+                indirect.append(seen[digest])
+            else:
+                seen[digest] = len(unique_chunks)
+                indirect.append(len(unique_chunks))
+                unique_chunks.append((i, chunk))
+
+        # Consume completions as they land rather than barriering on the
+        # slowest chunk: progress is visible on long papers, and the merge
+        # step launches in the same tick the final summary arrives
+        async def _summarize_slot(slot: int, i: int, chunk: str):
+            return slot, await _summarize_chunk(i, chunk)
+
+        unique_summaries: List[Any] = [None] * len(unique_chunks)
+        pending = [
+            asyncio.ensure_future(_summarize_slot(slot, i, chunk))
+            for slot, (i, chunk) in enumerate(unique_chunks)
+        ]
+        done = 0
+        for future in asyncio.as_completed(pending):
+            slot, summary = await future
+            unique_summaries[slot] = summary
+            done += 1
+            logger.debug(f"Chunk summary {done}/{len(pending)} complete")
+
+        if len(unique_chunks) < len(chunks):
+            logger.info(
+                f"Deduplicated {len(chunks) - len(unique_chunks)} identical "
+                "chunks before summarization"
+            )
+        return [unique_summaries[j] for j in indirect]
+
+    async def summarize_paper(self,
+                             filepath: str,
                              generate_code: bool = False,
                              generate_blog: bool = False,
                              blog_style_sample: str = "",
                              model: str = None,
-                             output_token_limit: Optional[int] = None) -> Dict[str, Any]:
+                             output_token_limit: Optional[int] = None,
+                             store: bool = True,
+                             use_batch_api: bool = False) -> Dict[str, Any]:
         """
         Process and summarize a research paper.
-        
+
         Args:
             filepath: Path to the PDF file
             generate_code: Whether to generate implementation code
@@ -213,104 +310,193 @@ class PaperSummarizer:
             blog_style_sample: Sample of user's blog writing style
             model: Model to use for summarization
             output_token_limit: Maximum number of tokens for the output, overrides the default
-            
+            store: Store the result immediately; bulk callers pass False
+                and flush once at the end (see summarize_papers)
+            use_batch_api: Route chunk summarization through the provider
+                Batch API when the paper is long enough to amortize the
+                job turnaround (half-price, but minutes-to-hours latency)
+
         Returns:
             Dictionary with paper summary and generated content
         """
         logger.info(f"Processing paper: {filepath}")
-        
+
+        # True duplicates (same bytes, any path) short-circuit before any
+        # extraction or LLM work. The size+head fingerprint is probed
+        # first - microseconds, no full file read - and only on a miss is
+        # the authoritative whole-file content hash computed.
+        content_hash = None
+        fingerprint = None
+        try:
+            fingerprint = await asyncio.to_thread(self._fast_fingerprint, filepath)
+            existing_id = self.db_manager.get_by_fingerprint(fingerprint)
+            if not existing_id:
+                content_hash = await asyncio.to_thread(
+                    self._file_content_hash, filepath
+                )
+                existing_id = self.db_manager.get_by_content_hash(content_hash)
+            if existing_id:
+                existing = self.get_paper_summary(existing_id)
+                if existing:
+                    logger.info(
+                        f"Paper content already processed (ID: {existing_id}); "
+                        "returning stored summary"
+                    )
+                    return existing
+        except Exception as e:
+            logger.warning(f"Duplicate check failed, processing normally: {e}")
+        if content_hash is None:
+            try:
+                content_hash = await asyncio.to_thread(
+                    self._file_content_hash, filepath
+                )
+            except Exception:
+                pass
+
         # Use provided token limit or default
         token_limit = output_token_limit or self.output_token_limit
-        
-        # Extract and chunk the PDF
-        extracted_data = self.pdf_processor.extract_and_chunk(filepath)
+
+        # Extract and chunk the PDF in a worker thread: parsing is
+        # blocking CPU+disk work, and running it off the loop lets other
+        # paper pipelines keep their LLM calls in flight meanwhile
+        extracted_data = await asyncio.to_thread(
+            self.pdf_processor.extract_and_chunk, filepath
+        )
         metadata = extracted_data["metadata"]
         chunks = extracted_data["chunks"]
         
         logger.info(f"Extracted {len(chunks)} chunks from paper")
         
-        # Generate chunk summaries in parallel
-        chunk_summary_tasks = []
-        for i, chunk in enumerate(chunks):
-            is_first = (i == 0)
-            is_last = (i == len(chunks) - 1)
-            
-            task = self.llm_interface.summarize_paper_chunk(
-                chunk=chunk,
+        # Long papers can trade latency for the Batch API's pricing: one
+        # uploaded job replaces per-chunk online calls. Any failure there
+        # falls through to the normal path.
+        chunk_summaries = None
+        if use_batch_api and len(chunks) >= _BATCH_API_MIN_CHUNKS:
+            try:
+                chunk_summaries = await self.llm_interface.summarize_paper_chunks_batch(
+                    chunks, metadata, model
+                )
+                logger.info(
+                    f"Summarized {len(chunks)} chunks via the Batch API"
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Batch API summarization failed ({e}); "
+                    "falling back to online calls"
+                )
+                chunk_summaries = None
+
+        if chunk_summaries is None:
+            chunk_summaries = await self._summarize_chunks_online(
+                chunks, metadata, model
+            )
+        logger.info(f"Generated summaries for {len(chunk_summaries)} chunks")
+
+        # Merge the chunk summaries and generate the comprehensive analysis
+        # concurrently. The analysis only needs a rough view of the paper,
+        # which the chunk summaries already provide - building a preliminary
+        # summary from them lets both LLM calls overlap instead of the
+        # analysis waiting on the merge round trip.
+        def _joined(field: str, limit: int) -> str:
+            parts = [str(s.get(field, "")) for s in chunk_summaries if s.get(field)]
+            return "\n\n".join(parts)[:limit]
+
+        preliminary_summary = {
+            "OVERVIEW": _joined("SUMMARY", 8000),
+            "METHODOLOGY": _joined("TECHNICAL_DETAILS", 4000),
+            "KEY_RESULTS": _joined("RESULTS", 4000)
+        }
+
+        logger.info("Generating full paper summary and comprehensive analysis...")
+        full_summary, analysis = await asyncio.gather(
+            self.llm_interface.merge_chunk_summaries(
+                summaries=chunk_summaries,
                 metadata=metadata,
-                is_first_chunk=is_first,
-                is_last_chunk=is_last,
                 model=model
+            ),
+            self.llm_interface.generate_comprehensive_analysis(
+                paper_summary=preliminary_summary,
+                paper_title=metadata.get("title", ""),
+                model=model,
+                max_tokens=token_limit
             )
-            chunk_summary_tasks.append(task)
-        
-        chunk_summaries = await asyncio.gather(*chunk_summary_tasks)
-        logger.info(f"Generated summaries for {len(chunk_summaries)} chunks")
-        
-        # Merge chunk summaries into a full paper summary
-        full_summary = await self.llm_interface.merge_chunk_summaries(
-            summaries=chunk_summaries,
-            metadata=metadata,
-            model=model
         )
-        
-        logger.info("Generated full paper summary")
-        
-        # Generate comprehensive analysis
-        logger.info("Generating comprehensive analysis...")
-        analysis = await self.llm_interface.generate_comprehensive_analysis(
-            paper_summary=full_summary,
-            paper_title=metadata.get("title", ""),
-            model=model,
-            max_tokens=token_limit
-        )
-        
-        logger.info("Generated comprehensive analysis")
-        
-        # Generate similar paper recommendations
-        similar_papers = await self.llm_interface.generate_similar_papers(
-            paper_summary=full_summary,
-            paper_title=metadata.get("title", ""),
-            model=model
-        )
-        
-        logger.info(f"Generated {len(similar_papers)} similar paper recommendations")
-        
-        # Generate code implementation if requested
-        code_implementation = None
+
+        logger.info("Generated full paper summary and comprehensive analysis")
+
+        # Everything downstream depends only on full_summary and is
+        # independent of each other, so recommendations, domain detection
+        # and the optional code/blog generation all run in one gather -
+        # a single round-trip latency instead of four sequential ones
+        async def _noop():
+            return None
+
         if generate_code and full_summary.get("ARCHITECTURE"):
             # Use Gemini Flash 2.0 by default for code generation if no model specified
             code_model = model if model else "gemini-1.5-flash-2.0"
-            code_implementation = await self.llm_interface.generate_code_implementation(
+            code_task = self.llm_interface.generate_code_implementation(
                 architecture_details=full_summary.get("ARCHITECTURE", ""),
                 paper_title=metadata.get("title", ""),
                 model=code_model
             )
-            logger.info("Generated code implementation")
-        
-        # Generate blog post if requested
-        blog_post = None
+        else:
+            code_task = _noop()
+
         if generate_blog:
-            blog_post = await self.llm_interface.generate_blog_post(
+            blog_task = self.llm_interface.generate_blog_post(
                 paper_summary=full_summary,
                 paper_title=metadata.get("title", ""),
                 blog_style_sample=blog_style_sample,
                 model=model
             )
-            logger.info("Generated blog post")
-        
-        # Generate paper_id for storage
-        paper_id = self._generate_paper_id(
-            filepath=filepath,
-            title=metadata.get("title", "")
-        )
-        
-        # Determine paper domain
-        domain = await self.determine_paper_domain(
-            title=metadata.get("title", ""),
-            summary=full_summary.get("OVERVIEW", "")
+        else:
+            blog_task = _noop()
+
+        similar_papers, domain, code_implementation, blog_post = await asyncio.gather(
+            self.llm_interface.generate_similar_papers(
+                paper_summary=full_summary,
+                paper_title=metadata.get("title", ""),
+                model=model
+            ),
+            self.determine_paper_domain(
+                title=metadata.get("title", ""),
+                summary=full_summary.get("OVERVIEW", "")
+            ),
+            code_task,
+            blog_task,
+            return_exceptions=True
         )
-        
+
+        # Per-task fallbacks: one failed branch shouldn't sink the paper
+        if isinstance(similar_papers, BaseException):
+            logger.error(f"Failed to generate similar papers: {similar_papers}")
+            similar_papers = []
+        if isinstance(domain, BaseException):
+            logger.error(f"Failed to determine paper domain: {domain}")
+            domain = "Unknown"
+        if isinstance(code_implementation, BaseException):
+            logger.error(f"Failed to generate code implementation: {code_implementation}")
+            code_implementation = None
+        if isinstance(blog_post, BaseException):
+            logger.error(f"Failed to generate blog post: {blog_post}")
+            blog_post = None
+
+        logger.info(f"Generated {len(similar_papers)} similar paper recommendations")
+        if code_implementation:
+            logger.info("Generated code implementation")
+        if blog_post:
+            logger.info("Generated blog post")
+
+        # Paper ID comes from the content hash: stable across renames and
+        # immune to the title-dependent collisions of the old md5 scheme
+        if content_hash:
+            paper_id = content_hash[:16]
+        else:
+            paper_id = self._generate_paper_id(
+                filepath=filepath,
+                title=metadata.get("title", "")
+            )
+
         # Extract additional fields from analysis
         takeaways = analysis.get("TAKEAWAYS", [])
         important_ideas = analysis.get("IMPORTANT_IDEAS", [])
@@ -325,6 +511,8 @@ class PaperSummarizer:
             "paper_id": paper_id,
             "title": metadata.get("title", ""),
             "filepath": filepath,
+            "content_hash": content_hash,
+            "fingerprint": fingerprint,
             "timestamp": datetime.now().isoformat(),
             "metadata": metadata,
             "domain": domain,
@@ -344,6 +532,9 @@ class PaperSummarizer:
             "background": full_summary.get("BACKGROUND", ""),
             "math_formulations": full_summary.get("MATH_FORMULATIONS", ""),
             "similar_papers": similar_papers,
+            # Titles pulled out once here so the store path doesn't walk
+            # the recommendation dicts again on every write
+            "_similar_titles": [p.get("title", "") for p in similar_papers],
             "highlighted_text": extracted_data.get("highlighted_text", []),
             "figures_tables": extracted_data.get("figures_tables", [])
         }
@@ -356,28 +547,85 @@ class PaperSummarizer:
             result["blog_post"] = blog_post
         
         # Store in database
-        self._store_paper_summary(result)
-        
+        if store:
+            self._store_paper_summary(result)
+
+        # Report how much paid LLM work the cache tiers absorbed
+        for label, cache in (
+            ("LLM response cache", getattr(self.llm_interface, "response_cache", None)),
+            ("semantic cache", getattr(self.llm_interface, "semantic_cache", None)),
+        ):
+            if cache is not None:
+                logger.info(
+                    f"{label}: {cache.stats['hits']} hits, "
+                    f"{cache.stats['misses']} misses this session"
+                )
+
         return result
-    
+
+    async def summarize_papers(self,
+                               filepaths: List[str],
+                               **kwargs) -> List[Dict[str, Any]]:
+        """
+        Summarize several papers and store them in one batched upsert.
+
+        Per-paper pipelines run concurrently (each already throttled by the
+        chunk semaphore and rate limiter); database writes are deferred and
+        flushed through add_papers_bulk, amortizing embedding and HNSW
+        insert cost across the whole directory.
+
+        Args:
+            filepaths: Paths to the PDF files
+            **kwargs: Passed through to summarize_paper
+
+        Returns:
+            One result dict per paper, in input order; failed papers yield
+            their exception instead
+        """
+        kwargs["store"] = False
+        results = await asyncio.gather(
+            *(self.summarize_paper(filepath, **kwargs) for filepath in filepaths),
+            return_exceptions=True
+        )
+
+        records = [
+            self._record_from_result(result)
+            for result in results if not isinstance(result, BaseException)
+        ]
+        try:
+            self.db_manager.add_papers_bulk(records)
+            logger.info(f"Stored {len(records)} paper summaries in one bulk upsert")
+        except Exception as e:
+            logger.error(f"Failed to bulk-store paper summaries: {e}")
+
+        return results
+
+    @staticmethod
+    def _record_from_result(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Map a summarize_paper result onto add_paper keyword arguments."""
+        return {
+            "paper_id": result["paper_id"],
+            "title": result["title"],
+            "filepath": result["filepath"],
+            "summary": result["summary"],
+            "takeaways": result["takeaways"],
+            "architecture": result["architecture"],
+            "important_ideas": result.get("important_ideas", []),
+            "future_ideas": result["future_directions"],
+            "background": result["background"],
+            "math_formulations": result["math_formulations"],
+            "similar_papers": result.get("_similar_titles")
+                or [p.get("title", "") for p in result.get("similar_papers", [])],
+            "novelty": result.get("novelty", ""),
+            "domain": result.get("domain", "Unknown"),
+            "content_hash": result.get("content_hash"),
+            "fingerprint": result.get("fingerprint")
+        }
+
     def _store_paper_summary(self, result: Dict[str, Any]) -> None:
         """Store paper summary in the database."""
         try:
-            self.db_manager.add_paper(
-                paper_id=result["paper_id"],
-                title=result["title"],
-                filepath=result["filepath"],
-                summary=result["summary"],
-                takeaways=result["takeaways"],
-                architecture=result["architecture"],
-                important_ideas=result.get("important_ideas", []),
-                future_ideas=result["future_directions"],
-                background=result["background"],
-                math_formulations=result["math_formulations"],
-                similar_papers=[p.get("title", "") for p in result.get("similar_papers", [])],
-                novelty=result.get("novelty", ""),
-                domain=result.get("domain", "Unknown")
-            )
+            self.db_manager.add_paper(**self._record_from_result(result))
             logger.info(f"Stored paper summary in database with ID: {result['paper_id']}")
         except Exception as e:
             logger.error(f"Failed to store paper summary in database: {e}")
@@ -1,15 +1,58 @@
 import os
+import sys
+import json
+import logging
 import chromadb
 from chromadb.config import Settings
 from typing import Dict, List, Optional, Any
 
+logger = logging.getLogger(__name__)
+
+# orjson encodes/decodes the JSON list fields in metadata noticeably
+# faster than stdlib json, which adds up when bulk-indexing; fall back
+# silently when it isn't installed
+try:
+    import orjson as _fast_json
+except ImportError:
+    _fast_json = None
+
+def _json_dumps(obj: Any) -> str:
+    """Serialize a metadata list field to a JSON string."""
+    if _fast_json is not None:
+        return _fast_json.dumps(obj).decode()
+    return json.dumps(obj)
+
+def _json_loads(raw: str) -> Any:
+    """Deserialize a JSON-encoded metadata field."""
+    if _fast_json is not None:
+        # orjson.JSONDecodeError subclasses ValueError, so callers keep
+        # their existing fallback handling
+        return _fast_json.loads(raw)
+    return json.loads(raw)
+
+# Optional SQ8 vector quantization: 8-bit codes cut index RAM ~4x and
+# speed up the memory-bandwidth-bound candidate scan, with an ADC rerank
+# recovering recall. Plain float32 Chroma is used when unavailable.
+try:
+    from turbochroma import QuantizedCollection, SQ8Codec
+except ImportError:
+    QuantizedCollection = None
+
+# HNSW tunables, overridable per deployment. Cosine is the right metric
+# for normalized text embeddings; a higher M buys recall at fixed search
+# ef. These only take effect when the collection is first created -
+# existing collections keep the config they were built with.
+_HNSW_M = int(os.environ.get("RESEARCHPAL_HNSW_M", 32))
+_HNSW_CONSTRUCTION_EF = int(os.environ.get("RESEARCHPAL_HNSW_CONSTRUCTION_EF", 200))
+_HNSW_SEARCH_EF = int(os.environ.get("RESEARCHPAL_HNSW_SEARCH_EF", 128))
+
 class ChromaManager:
     """Manages interactions with ChromaDB for storing paper information."""
-    
+
     def __init__(self, persist_directory: str = "~/.research_pal/chroma_db"):
         self.persist_directory = os.path.expanduser(persist_directory)
         os.makedirs(self.persist_directory, exist_ok=True)
-        
+
         # Initialize ChromaDB client
         self.client = chromadb.PersistentClient(
             path=self.persist_directory,
@@ -18,12 +61,27 @@ class ChromaManager:
                 allow_reset=True
             )
         )
-        
+
         # Create or get collections for papers
         self.papers_collection = self.client.get_or_create_collection(
             name="papers",
-            metadata={"description": "Research paper summaries and metadata"}
+            metadata={
+                "description": "Research paper summaries and metadata",
+                "hnsw:space": "cosine",
+                "hnsw:M": _HNSW_M,
+                "hnsw:construction_ef": _HNSW_CONSTRUCTION_EF,
+                "hnsw:search_ef": _HNSW_SEARCH_EF,
+            }
         )
+
+        # Quantized search returns approximate distances, so queries
+        # over-fetch and keep the best n after the ADC rerank
+        self._query_overfetch = 1
+        if QuantizedCollection is not None:
+            self.papers_collection = QuantizedCollection(
+                self.papers_collection, codec=SQ8Codec(sparse_rotation=True)
+            )
+            self._query_overfetch = 4
     
     def add_paper(self, 
                  paper_id: str,
@@ -39,7 +97,9 @@ class ChromaManager:
                  math_formulations: Optional[str] = None,
                  similar_papers: Optional[List[str]] = None,
                  novelty: Optional[str] = None,
-                 domain: Optional[str] = "Unknown") -> None:
+                 domain: Optional[str] = "Unknown",
+                 content_hash: Optional[str] = None,
+                 fingerprint: Optional[str] = None) -> None:
         """
         Add or update a paper in the database.
         
@@ -57,86 +117,201 @@ class ChromaManager:
             similar_papers: Recommended similar papers
             novelty: Description of the paper's novelty
             domain: Research domain (e.g., NLP, CV, RL)
+            content_hash: Hash of the PDF bytes, for duplicate detection
+            fingerprint: Cheap size+head fingerprint, for fast duplicate probes
         """
-        # Create metadata dictionary
+        # Thin wrapper over the bulk path so single and batched writes
+        # share one code path
+        self.add_papers_bulk([{
+            "paper_id": paper_id, "title": title, "filepath": filepath,
+            "summary": summary, "takeaways": takeaways,
+            "architecture": architecture, "important_ideas": important_ideas,
+            "future_ideas": future_ideas, "background": background,
+            "math_formulations": math_formulations,
+            "similar_papers": similar_papers, "novelty": novelty,
+            "domain": domain, "content_hash": content_hash,
+            "fingerprint": fingerprint
+        }])
+
+    def _build_record(self,
+                      paper_id: str,
+                      title: str,
+                      filepath: str,
+                      summary: str,
+                      takeaways: List[str],
+                      architecture: Optional[str] = None,
+                      important_ideas: Optional[List[str]] = None,
+                      future_ideas: Optional[List[str]] = None,
+                      background: Optional[str] = None,
+                      math_formulations: Optional[str] = None,
+                      similar_papers: Optional[List[str]] = None,
+                      novelty: Optional[str] = None,
+                      domain: Optional[str] = "Unknown",
+                      content_hash: Optional[str] = None,
+                      fingerprint: Optional[str] = None) -> tuple:
+        """Build the (id, document_text, metadata) triple for one paper."""
+        # Structured fields live in metadata (Chroma metadata values must
+        # be primitives, so list fields are JSON-encoded); the document is
+        # only the short semantic text worth embedding. The old scheme
+        # embedded every section concatenated and tried to re-parse it on
+        # read, which was both slower to encode and lossy
         metadata = {
             "title": title,
-            "filepath": filepath,
-            "domain": domain,
+            # Normalized so the metadata index can answer exact-path
+            # lookups (get_by_filepath)
+            "filepath": os.path.abspath(os.path.expanduser(filepath)) if filepath else "",
+            # Interned: domains are a handful of repeated short strings,
+            # and sharing one object per value keeps the metadata index
+            # (which makes the $eq filters above index probes rather than
+            # scans; chromadb>=0.5.5) compact
+            "domain": sys.intern(domain) if domain else "Unknown",
             "has_architecture": architecture is not None,
-            "has_math": math_formulations is not None
-        }
-        
-        # Create document content
-        document = {
-            "summary": summary,
-            "takeaways": " | ".join(takeaways) if takeaways else "",
+            "has_math": math_formulations is not None,
+            "summary": summary or "",
             "architecture": architecture or "",
-            "important_ideas": " | ".join(important_ideas) if important_ideas else "",
-            "future_ideas": " | ".join(future_ideas) if future_ideas else "",
             "background": background or "",
             "math_formulations": math_formulations or "",
-            "similar_papers": " | ".join(similar_papers) if similar_papers else "",
             "novelty": novelty or "",
-            "domain": domain
+            "takeaways": _json_dumps(takeaways or []),
+            "important_ideas": _json_dumps(important_ideas or []),
+            "future_ideas": _json_dumps(future_ideas or []),
+            "similar_papers": _json_dumps(similar_papers or []),
         }
-        
-        # Convert document to string for embedding
-        document_text = " ".join([f"{k}: {v}" for k, v in document.items() if v])
-        
-        # Add to collection (upsert if already exists)
-        self.papers_collection.upsert(
-            ids=[paper_id],
-            documents=[document_text],
-            metadatas=[metadata]
-        )
+        if content_hash:
+            metadata["content_hash"] = content_hash
+        if fingerprint:
+            metadata["fingerprint"] = fingerprint
+
+        # Short semantic text for embedding: title, summary and takeaways
+        # carry the searchable meaning; boilerplate sections only dilute it
+        document_text = "\n".join(filter(None, [
+            title,
+            summary,
+            " | ".join(takeaways) if takeaways else ""
+        ]))
+
+        return paper_id, document_text, metadata
+
+    def add_papers_bulk(self, records: List[Dict[str, Any]],
+                        batch_size: int = 4096) -> None:
+        """
+        Upsert many papers in batched calls.
+
+        One upsert per paper means one embedding pass and one HNSW insert
+        each; batching amortizes both when indexing a directory of PDFs.
+
+        Args:
+            records: List of add_paper keyword dicts
+            batch_size: Maximum papers per upsert call
+        """
+        if not records:
+            return
+
+        ids, documents, metadatas = [], [], []
+        for record in records:
+            paper_id, document_text, metadata = self._build_record(**record)
+            ids.append(paper_id)
+            documents.append(document_text)
+            metadatas.append(metadata)
+
+        for start in range(0, len(ids), batch_size):
+            end = start + batch_size
+            self.papers_collection.upsert(
+                ids=ids[start:end],
+                documents=documents[start:end],
+                metadatas=metadatas[start:end]
+            )
     
+    def get_by_filepath(self, filepath: str) -> Optional[str]:
+        """
+        Look up a paper ID by its (normalized) file path.
+
+        A metadata $eq filter is an index probe - no embedding query and no
+        document parsing - so this is the cheap way to answer "have we
+        already processed this file?".
+
+        Args:
+            filepath: Path to the PDF file
+
+        Returns:
+            The paper ID, or None if the file has not been processed
+        """
+        normalized = os.path.abspath(os.path.expanduser(filepath))
+        results = self.papers_collection.get(
+            where={"filepath": {"$eq": normalized}},
+            limit=1,
+            include=[]
+        )
+        return results["ids"][0] if results["ids"] else None
+
+    def get_by_content_hash(self, content_hash: str) -> Optional[str]:
+        """
+        Look up a paper ID by the hash of its PDF bytes.
+
+        Catches true duplicates that get_by_filepath misses (same file
+        copied or moved to a different path).
+
+        Args:
+            content_hash: Hash of the file contents
+
+        Returns:
+            The paper ID, or None if no paper has these contents
+        """
+        results = self.papers_collection.get(
+            where={"content_hash": {"$eq": content_hash}},
+            limit=1,
+            include=[]
+        )
+        return results["ids"][0] if results["ids"] else None
+
+    def get_by_fingerprint(self, fingerprint: str) -> Optional[str]:
+        """
+        Look up a paper ID by its size+head fingerprint.
+
+        Much cheaper to compute than the full content hash, so callers
+        probe this first and fall back to get_by_content_hash on a miss.
+
+        Args:
+            fingerprint: Value from the summarizer's _fast_fingerprint
+
+        Returns:
+            The paper ID, or None if no paper matches the fingerprint
+        """
+        results = self.papers_collection.get(
+            where={"fingerprint": {"$eq": fingerprint}},
+            limit=1,
+            include=[]
+        )
+        return results["ids"][0] if results["ids"] else None
+
+    @staticmethod
+    def _paper_from_metadata(paper_id: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Decode a stored metadata dict into a paper dict."""
+        result = dict(metadata)
+        result["paper_id"] = paper_id
+        # List fields are stored JSON-encoded
+        for field in ["takeaways", "important_ideas", "future_ideas", "similar_papers"]:
+            raw = result.get(field, "[]")
+            if isinstance(raw, str):
+                try:
+                    result[field] = _json_loads(raw)
+                except ValueError:
+                    # Legacy entries stored pipe-joined strings
+                    result[field] = [item.strip() for item in raw.split("|") if item.strip()]
+
+        return result
+
     def get_paper(self, paper_id: str) -> Dict[str, Any]:
         """Retrieve a paper by its ID."""
-        results = self.papers_collection.get(ids=[paper_id])
-        
+        # Everything lives in metadata; skip fetching the document text
+        results = self.papers_collection.get(
+            ids=[paper_id], include=["metadatas"]
+        )
+
         if not results["ids"]:
             return None
-        
-        # Parse the document text back into a structured format
-        document_text = results["documents"][0]
-        metadata = results["metadatas"][0]
-        
-        # Parse document sections
-        sections = {}
-        current_section = None
-        current_content = []
-        
-        for line in document_text.split("\n"):
-            if ": " in line and line.split(": ")[0].lower() in [
-                "summary", "takeaways", "architecture", "important_ideas", 
-                "future_ideas", "background", "math_formulations", 
-                "similar_papers", "novelty", "domain"
-            ]:
-                # Save previous section
-                if current_section:
-                    sections[current_section] = "\n".join(current_content)
-                
-                # Start new section
-                section_parts = line.split(": ", 1)
-                current_section = section_parts[0].lower()
-                current_content = [section_parts[1]] if len(section_parts) > 1 else []
-            else:
-                if current_section:
-                    current_content.append(line)
-        
-        # Save last section
-        if current_section:
-            sections[current_section] = "\n".join(current_content)
-        
-        # Process list fields
-        for field in ["takeaways", "important_ideas", "future_ideas", "similar_papers"]:
-            if field in sections:
-                sections[field] = [item.strip() for item in sections[field].split("|") if item.strip()]
-        
-        # Combine with metadata
-        result = {**sections, **metadata}
-        return result
+
+        return self._paper_from_metadata(results["ids"][0], results["metadatas"][0])
     
     def search_papers(self, query: str, n_results: int = 5) -> List[Dict[str, Any]]:
         """
@@ -160,20 +335,19 @@ class ChromaManager:
             title_query = query.split(":", 1)[1].strip()
             return self.search_by_title(title_query, n_results=n_results)
             
-        # Standard vector search
+        # Standard vector search; metadatas come back with the query
+        # results, so one call replaces the old 1+N lookup pattern
         try:
             results = self.papers_collection.query(
                 query_texts=[query],
-                n_results=n_results
+                n_results=n_results * self._query_overfetch,
+                include=["metadatas"]
             )
-            
-            papers = []
-            for i, paper_id in enumerate(results["ids"][0]):
-                paper = self.get_paper(paper_id)
-                if paper:  # Ensure paper exists
-                    papers.append(paper)
-                
-            return papers
+
+            return [
+                self._paper_from_metadata(paper_id, metadata)
+                for paper_id, metadata in zip(results["ids"][0], results["metadatas"][0])
+            ][:n_results]
         except Exception as e:
             logger.error(f"Error searching papers: {e}")
             # Return empty list on error
@@ -181,18 +355,18 @@ class ChromaManager:
     
     def search_by_domain(self, domain: str, n_results: int = 5) -> List[Dict[str, Any]]:
         """Search for papers by research domain."""
-        # Get all papers with matching domain metadata
+        # One filtered fetch with the limit pushed into the database, so
+        # only the requested rows are materialized and decoded
         results = self.papers_collection.get(
-            where={"domain": {"$eq": domain}}
+            where={"domain": {"$eq": domain}},
+            limit=n_results,
+            include=["metadatas"]
         )
-        
-        papers = []
-        for i, paper_id in enumerate(results["ids"]):
-            paper = self.get_paper(paper_id)
-            papers.append(paper)
-            
-        # Limit to requested number
-        return papers[:n_results]
+
+        return [
+            self._paper_from_metadata(paper_id, metadata)
+            for paper_id, metadata in zip(results["ids"], results["metadatas"])
+        ]
     
     def search_by_title(self, title_query: str, n_results: int = 5) -> List[Dict[str, Any]]:
         """
@@ -210,37 +384,37 @@ class ChromaManager:
             
             # 1. Try metadata where filter first (more precise but requires exact match)
             title_results = self.papers_collection.get(
-                where={"title": {"$contains": title_query}}
+                where={"title": {"$contains": title_query}},
+                include=["metadatas"]
             )
             
             # 2. Use vector search as backup (better semantic matching)
             augmented_query = f"title: {title_query}"
             vector_results = self.papers_collection.query(
                 query_texts=[augmented_query],
-                n_results=n_results
+                n_results=n_results,
+                include=["metadatas"]
             )
-            
-            # Combine results, prioritizing exact matches
+
+            # Combine results, prioritizing exact matches; metadatas are
+            # already in hand from both calls, no per-id re-fetch needed
             paper_ids = set()
             results = []
-            
+
             # Add exact matches first
-            if title_results["ids"]:
-                for i, paper_id in enumerate(title_results["ids"]):
-                    if paper_id not in paper_ids:
-                        paper = self.get_paper(paper_id)
-                        if paper:
-                            results.append(paper)
-                            paper_ids.add(paper_id)
-            
+            for paper_id, metadata in zip(title_results["ids"],
+                                          title_results["metadatas"]):
+                if paper_id not in paper_ids:
+                    results.append(self._paper_from_metadata(paper_id, metadata))
+                    paper_ids.add(paper_id)
+
             # Add vector matches
             if "ids" in vector_results and vector_results["ids"]:
-                for i, paper_id in enumerate(vector_results["ids"][0]):
+                for paper_id, metadata in zip(vector_results["ids"][0],
+                                              vector_results["metadatas"][0]):
                     if paper_id not in paper_ids and len(results) < n_results:
-                        paper = self.get_paper(paper_id)
-                        if paper:
-                            results.append(paper)
-                            paper_ids.add(paper_id)
+                        results.append(self._paper_from_metadata(paper_id, metadata))
+                        paper_ids.add(paper_id)
             
             # Sort results by relevance to the title query
             # Simple sorting - title contains query gets priority
@@ -253,28 +427,61 @@ class ChromaManager:
             # Return empty list on error
             return []
     
+    # Fields woven into the embedded document text; changing one requires
+    # re-embedding. Everything else lives only in metadata.
+    _EMBEDDED_FIELDS = {"title", "summary", "takeaways"}
+    _JSON_LIST_FIELDS = {"takeaways", "important_ideas", "future_ideas", "similar_papers"}
+
+    # Every add_paper argument except paper_id, for round-tripping a
+    # stored paper back into a record without enumerating kwargs
+    _RECORD_FIELDS = (
+        "title", "filepath", "summary", "takeaways", "architecture",
+        "important_ideas", "future_ideas", "background",
+        "math_formulations", "similar_papers", "novelty", "domain",
+        "content_hash", "fingerprint"
+    )
+
     def update_paper_field(self, paper_id: str, field: str, value: Any) -> None:
         """Update a specific field for a paper."""
+        if field not in self._EMBEDDED_FIELDS:
+            # Metadata-only change: a collection.update skips the
+            # embedding inference entirely
+            results = self.papers_collection.get(
+                ids=[paper_id], include=["metadatas"]
+            )
+            if not results["ids"]:
+                raise ValueError(f"Paper with ID {paper_id} not found")
+
+            metadata = results["metadatas"][0]
+            if field in self._JSON_LIST_FIELDS:
+                metadata[field] = _json_dumps(value or [])
+            elif field == "filepath":
+                metadata[field] = (
+                    os.path.abspath(os.path.expanduser(value)) if value else ""
+                )
+            else:
+                metadata[field] = value if value is not None else ""
+            # Keep the derived flags consistent with their source fields
+            if field == "architecture":
+                metadata["has_architecture"] = bool(value)
+            elif field == "math_formulations":
+                metadata["has_math"] = bool(value)
+
+            self.papers_collection.update(ids=[paper_id], metadatas=[metadata])
+            return
+
+        # Embedded-text change: rebuild the record so the document is
+        # re-embedded with the new content
         paper = self.get_paper(paper_id)
         if not paper:
             raise ValueError(f"Paper with ID {paper_id} not found")
         
         # Update the field
         paper[field] = value
-        
-        # Re-add the paper with updated information
+
+        # Re-add the paper with updated information; _build_record
+        # normalizes missing values, so nothing is silently dropped
         self.add_paper(
             paper_id=paper_id,
-            title=paper.get("title", ""),
-            filepath=paper.get("filepath", ""),
-            summary=paper.get("summary", ""),
-            takeaways=paper.get("takeaways", []),
-            architecture=paper.get("architecture", ""),
-            important_ideas=paper.get("important_ideas", []),
-            future_ideas=paper.get("future_ideas", []),
-            background=paper.get("background", ""),
-            math_formulations=paper.get("math_formulations", ""),
-            similar_papers=paper.get("similar_papers", []),
-            novelty=paper.get("novelty", ""),
-            domain=paper.get("domain", "Unknown")
+            **{key: paper.get(key) for key in self._RECORD_FIELDS}
         )
\ No newline at end of file
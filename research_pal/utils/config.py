@@ -2,15 +2,18 @@
 Configuration management for ResearchPal.
 """
 import os
-import yaml
+import json
+import types
 import logging
 from typing import Dict, Any, Optional
 
 logger = logging.getLogger(__name__)
 
-# Default configuration path
+# Default configuration path. JSON is the default on-disk format; a legacy
+# config.yaml is still read (and migrated) if present.
 CONFIG_DIR = os.path.expanduser("~/.research_pal")
-CONFIG_PATH = os.path.join(CONFIG_DIR, "config.yaml")
+CONFIG_PATH = os.path.join(CONFIG_DIR, "config.json")
+LEGACY_CONFIG_PATH = os.path.join(CONFIG_DIR, "config.yaml")
 
 # Default configuration values
 DEFAULT_CONFIG = {
@@ -23,6 +26,51 @@ DEFAULT_CONFIG = {
     "theme": "minimal",
     "disable_animations": True
 }
+
+# In-process memo of parsed configs keyed by (abspath, st_mtime_ns) so repeated
+# load_config calls during one CLI invocation don't re-read and re-parse the file
+_CONFIG_CACHE: Dict[Any, Dict[str, Any]] = {}
+
+# Memo of config-file API key lookups per provider; environment variables are
+# still checked on every call so env changes take effect immediately
+_API_KEY_CACHE: Dict[str, Optional[str]] = {}
+
+# Shared read-only view of the defaults for error/empty paths; avoids a dict
+# allocation per failed load (callers that mutate copy explicitly)
+_DEFAULT_VIEW = types.MappingProxyType(DEFAULT_CONFIG)
+
+def _is_yaml_path(path: str) -> bool:
+    """Whether a config path should be treated as YAML."""
+    return path.endswith((".yaml", ".yml"))
+
+def _yaml_load(data: bytes) -> Any:
+    """Parse YAML bytes; yaml is imported lazily so the JSON path skips it."""
+    import yaml
+    # Prefer the libyaml-backed loader when available (much faster parsing)
+    try:
+        from yaml import CSafeLoader as Loader
+    except ImportError:
+        from yaml import SafeLoader as Loader
+    return yaml.load(data, Loader=Loader)
+
+def _yaml_dump(config: Dict[str, Any], f) -> None:
+    """Serialize a config dict as YAML (lazy yaml import)."""
+    import yaml
+    # Prefer the libyaml-backed dumper; keep insertion order (no re-sort)
+    try:
+        from yaml import CSafeDumper as Dumper
+    except ImportError:
+        from yaml import SafeDumper as Dumper
+    yaml.dump(dict(config), f, Dumper=Dumper, default_flow_style=False, sort_keys=False)
+
+def _read_bytes(path: str) -> bytes:
+    """Read a whole file into bytes with a single unbuffered read."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.read(fd, os.fstat(fd).st_size)
+    finally:
+        os.close(fd)
+
 def load_config(config_path: Optional[str] = None) -> Dict[str, Any]:
     """
     Load configuration from file.
@@ -39,35 +87,83 @@ def load_config(config_path: Optional[str] = None) -> Dict[str, Any]:
     # Ensure directory exists
     os.makedirs(os.path.dirname(config_path), exist_ok=True)
     
-    # If config doesn't exist, create with defaults
-    if not os.path.exists(config_path):
+    # A single stat gives us both existence and the cache key mtime
+    try:
+        st = os.stat(config_path)
+    except FileNotFoundError:
+        # Migrate a legacy YAML config to the JSON default location once
+        if config_path == CONFIG_PATH and os.path.exists(LEGACY_CONFIG_PATH):
+            config = dict(load_config(LEGACY_CONFIG_PATH))
+            save_config(config, config_path)
+            return config
+
+        # Config doesn't exist, create with defaults
         save_config(DEFAULT_CONFIG, config_path)
         return DEFAULT_CONFIG.copy()
-    
+
+    # Return the cached parse if the file hasn't changed since we last read it
+    cache_key = (os.path.abspath(config_path), st.st_mtime_ns)
+    if cache_key in _CONFIG_CACHE:
+        return types.MappingProxyType(_CONFIG_CACHE[cache_key])
+
+    # For YAML configs, try the JSON sidecar first (written by save_config) -
+    # json parsing is much faster for cold-start loads
+    if _is_yaml_path(config_path):
+        sidecar = config_path + ".json"
+        try:
+            if os.stat(sidecar).st_mtime >= st.st_mtime:
+                config = json.loads(_read_bytes(sidecar))
+
+                if isinstance(config, dict):
+                    for key, value in DEFAULT_CONFIG.items():
+                        if key not in config:
+                            config[key] = value
+
+                    for key in ["db_path", "output_dir"]:
+                        value = config.get(key)
+                        if isinstance(value, str) and value.startswith("~"):
+                            config[key] = os.path.expanduser(value)
+
+                    _CONFIG_CACHE[cache_key] = config
+                    return types.MappingProxyType(config)
+        except Exception:
+            # Stale or corrupt sidecar - fall through to the YAML source of truth
+            pass
+
     # Load existing config
     try:
-        with open(config_path, "r") as f:
-            config = yaml.safe_load(f)
-        
+        # Read the whole file in one go; the loaders take bytes directly,
+        # skipping the TextIOWrapper layer
+        data = _read_bytes(config_path)
+        if _is_yaml_path(config_path):
+            config = _yaml_load(data)
+        else:
+            config = json.loads(data) if data.strip() else None
+
         # If config is empty, use defaults
         if config is None:
-            return DEFAULT_CONFIG.copy()
+            return _DEFAULT_VIEW
         
         # Update with any missing default keys
         for key, value in DEFAULT_CONFIG.items():
             if key not in config:
                 config[key] = value
         
-        # Process special values like paths with ~
+        # Process special values like paths with ~ (already-expanded
+        # values - the default config ships them expanded - pass through)
         for key in ["db_path", "output_dir"]:
-            if key in config and isinstance(config[key], str):
-                config[key] = os.path.expanduser(config[key])
-        
-        return config
+            value = config.get(key)
+            if isinstance(value, str) and value.startswith("~"):
+                config[key] = os.path.expanduser(value)
+
+        # Cache the fully-merged dict and hand out a read-only view; callers
+        # that need to mutate (e.g. configure) take an explicit dict() copy
+        _CONFIG_CACHE[cache_key] = config
+        return types.MappingProxyType(config)
     
     except Exception as e:
         logger.error(f"Error loading config from {config_path}: {e}")
-        return DEFAULT_CONFIG.copy()
+        return _DEFAULT_VIEW
 
 def save_config(config: Dict[str, Any], config_path: Optional[str] = None) -> None:
     """
@@ -82,11 +178,26 @@ def save_config(config: Dict[str, Any], config_path: Optional[str] = None) -> No
     
     # Ensure directory exists
     os.makedirs(os.path.dirname(config_path), exist_ok=True)
-    
+
+    # The file is about to change on disk; drop any cached parses and keys
+    _CONFIG_CACHE.clear()
+    _API_KEY_CACHE.clear()
+
     try:
-        with open(config_path, "w") as f:
-            yaml.dump(config, f, default_flow_style=False)
-        
+        if _is_yaml_path(config_path):
+            with open(config_path, "w") as f:
+                _yaml_dump(config, f)
+
+            # Emit a JSON sidecar so later loads can skip YAML parsing entirely
+            try:
+                with open(config_path + ".json", "w") as f:
+                    json.dump(dict(config), f)
+            except Exception as e:
+                logger.debug(f"Could not write config sidecar: {e}")
+        else:
+            with open(config_path, "w") as f:
+                json.dump(dict(config), f, indent=2)
+
         logger.info(f"Configuration saved to {config_path}")
     
     except Exception as e:
@@ -106,10 +217,13 @@ def get_api_key(provider: str) -> Optional[str]:
     env_var = f"{provider.upper()}_API_KEY"
     api_key = os.environ.get(env_var)
     
-    # If not in environment, try config file
+    # If not in environment, try config file (memoized per provider)
     if not api_key:
+        provider = provider.lower()
+        if provider in _API_KEY_CACHE:
+            return _API_KEY_CACHE[provider]
         config = load_config()
-        config_key = f"{provider.lower()}_api_key"
-        api_key = config.get(config_key, "")
-    
+        api_key = config.get(f"{provider}_api_key", "")
+        _API_KEY_CACHE[provider] = api_key if api_key else None
+
     return api_key if api_key else None
\ No newline at end of file
@@ -1,5 +1,6 @@
 from rich.console import Console
 from rich.panel import Panel
+from rich.progress import Progress
 from rich.text import Text
 from rich.markdown import Markdown
 from rich.table import Table
@@ -16,13 +17,33 @@ def display_logo():
     from research_pal.utils.enhanced_display import display_fancy_logo
     display_fancy_logo(console, animated=False)
 
+# (paper key, display heading) pairs for the list-style sections, in
+# display order
+_LIST_SECTIONS = (
+    ("takeaways", "Key Takeaways"),
+    ("important_ideas", "Important Ideas"),
+    ("limitations", "Limitations"),
+    ("practical_applications", "Practical Applications"),
+    ("future_directions", "Future Directions"),
+)
+
 def display_summary(paper: Dict[str, Any], theme: str = None):
     """Display a formatted summary of a paper."""
     title = paper.get("title", "Unknown Title")
     domain = paper.get("domain", "Unknown")
-    
+
+    # One lookup per color instead of several per section, and the markup
+    # tokens around headings and list items are assembled once here
+    # rather than per printed line
+    primary = get_theme_color("primary", theme)
+    secondary = get_theme_color("secondary", theme)
+    heading_open = f"\n[bold {primary}]"
+    heading_close = f"[/bold {primary}]"
+    item_open = f"  [{secondary}]"
+    item_close = f"[/{secondary}]"
+
     console.print(f"\n[bold blue]Paper Summary:[/bold blue] [cyan]{title}[/cyan] [dim]({domain})[/dim]\n")
-    
+
     # Create sections
     sections = [
         ("Overview", paper.get("summary", "No overview available.")),
@@ -42,76 +63,35 @@ def display_summary(paper: Dict[str, Any], theme: str = None):
                 Text(content),
                 title=f"[bold cyan]{section_title}[/bold cyan]",
                 expand=False,
-                border_style=get_theme_color("primary", theme)
+                border_style=primary
             )
             console.print(panel)
-    
-    # Display takeaways as a list
-    takeaways = paper.get("takeaways", [])
-    if takeaways:
-        console.print(f"\n[bold {get_theme_color('primary', theme)}]Key Takeaways:[/bold {get_theme_color('primary', theme)}]")
-        
-        if isinstance(takeaways, list):
-            for i, item in enumerate(takeaways):
-                console.print(f"  [{get_theme_color('secondary', theme)}]{i+1}.[/{get_theme_color('secondary', theme)}] {item}")
-        else:
-            console.print(f"  • {takeaways}")
-    
-    # Display important ideas as a list
-    important_ideas = paper.get("important_ideas", [])
-    if important_ideas:
-        console.print(f"\n[bold {get_theme_color('primary', theme)}]Important Ideas:[/bold {get_theme_color('primary', theme)}]")
-        
-        if isinstance(important_ideas, list):
-            for i, item in enumerate(important_ideas):
-                console.print(f"  [{get_theme_color('secondary', theme)}]{i+1}.[/{get_theme_color('secondary', theme)}] {item}")
-        else:
-            console.print(f"  • {important_ideas}")
-    
-    # Display limitations as a list
-    limitations = paper.get("limitations", [])
-    if limitations:
-        console.print(f"\n[bold {get_theme_color('primary', theme)}]Limitations:[/bold {get_theme_color('primary', theme)}]")
-        
-        if isinstance(limitations, list):
-            for i, item in enumerate(limitations):
-                console.print(f"  [{get_theme_color('secondary', theme)}]{i+1}.[/{get_theme_color('secondary', theme)}] {item}")
-        else:
-            console.print(f"  • {limitations}")
-    
-    # Display practical applications as a list
-    applications = paper.get("practical_applications", [])
-    if applications:
-        console.print(f"\n[bold {get_theme_color('primary', theme)}]Practical Applications:[/bold {get_theme_color('primary', theme)}]")
-        
-        if isinstance(applications, list):
-            for i, item in enumerate(applications):
-                console.print(f"  [{get_theme_color('secondary', theme)}]{i+1}.[/{get_theme_color('secondary', theme)}] {item}")
-        else:
-            console.print(f"  • {applications}")
-    
-    # Display future directions as a list
-    future = paper.get("future_directions", [])
-    if future:
-        console.print(f"\n[bold {get_theme_color('primary', theme)}]Future Directions:[/bold {get_theme_color('primary', theme)}]")
-        
-        if isinstance(future, list):
-            for i, item in enumerate(future):
-                console.print(f"  [{get_theme_color('secondary', theme)}]{i+1}.[/{get_theme_color('secondary', theme)}] {item}")
+
+    # Display the list-style sections with one shared loop
+    for key, heading in _LIST_SECTIONS:
+        items = paper.get(key, [])
+        if not items:
+            continue
+
+        console.print(f"{heading_open}{heading}:{heading_close}")
+
+        if isinstance(items, list):
+            for i, item in enumerate(items):
+                console.print(f"{item_open}{i+1}.{item_close} {item}")
         else:
-            console.print(f"  • {future}")
-    
+            console.print(f"  • {items}")
+
     # Display domain information
     domain = paper.get("domain", "Unknown")
     if domain != "Unknown":
-        console.print(f"\n[bold {get_theme_color('primary', theme)}]Research Domain:[/bold {get_theme_color('primary', theme)}] {domain}")
-    
+        console.print(f"{heading_open}Research Domain:{heading_close} {domain}")
+
     # Display similar papers if available
     similar = paper.get("similar_papers", [])
     if similar:
-        console.print(f"\n[bold {get_theme_color('primary', theme)}]Similar Papers:[/bold {get_theme_color('primary', theme)}]")
-        
-        table = Table(show_header=True, header_style=f"bold {get_theme_color('secondary', theme)}")
+        console.print(f"{heading_open}Similar Papers:{heading_close}")
+
+        table = Table(show_header=True, header_style=f"bold {secondary}")
         table.add_column("Title")
         table.add_column("Authors")
         table.add_column("Year")
@@ -130,18 +110,28 @@ def format_code_for_display(code: str) -> str:
     # Basic formatting if no special formatting needed
     return code
 
+# Shared Progress for display_progress callers: rich batches terminal
+# writes at a capped refresh rate, so updates are counter bumps instead
+# of a full bar re-render per call
+_progress = None
+_progress_task = None
+
 def display_progress(current: int, total: int, description: str = "Processing", theme: str = None):
     """Display a progress bar."""
-    percentage = int(100 * current / total)
-    bar_length = 40
-    filled_length = int(bar_length * current / total)
-    
-    bar = "█" * filled_length + "░" * (bar_length - filled_length)
-    
-    console.print(f"\r{description}: [{bar}] {percentage}% ({current}/{total})", end="")
-    
-    if current == total:
-        console.print("")
+    global _progress, _progress_task
+
+    if _progress is None:
+        _progress = Progress(console=console)
+        _progress.start()
+        _progress_task = _progress.add_task(description, total=total)
+
+    _progress.update(_progress_task, completed=current, total=total,
+                     description=description)
+
+    if current >= total:
+        _progress.stop()
+        _progress = None
+        _progress_task = None
 
 def display_paper_list(papers: List[Dict[str, Any]], theme: str = None):
     """Display a list of papers in a nicely formatted table."""
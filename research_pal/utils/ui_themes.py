@@ -2,14 +2,15 @@
 """UI themes and enhanced display functionality for ResearchPal."""
 import os
 import sys
+import types
 import random
 import time
+import itertools
 import threading
-from rich.console import Console
+from rich.console import Console, Group
 from rich.text import Text
 from rich.panel import Panel
 from rich.style import Style
-from rich.layout import Layout
 from rich.live import Live
 from rich.columns import Columns
 from rich.align import Align
@@ -96,14 +97,30 @@ THEMES = {
     }
 }
 
+# Theme names in a stable order (for CLI Choice lists etc.)
+THEME_NAMES = tuple(THEMES)
+
+# Themes that use the simplified, animation-free presentation
+MINIMAL_THEMES = frozenset({"minimal", "professional"})
+
+# Attribute-access views of the themes: ns.primary is a C-level slot
+# lookup, cheaper than the dict.get-with-default in get_theme_color
+THEMES_NS = {
+    name: types.SimpleNamespace(**colors) for name, colors in THEMES.items()
+}
+
 # Active theme (default)
 active_theme = THEMES["minimal"]  # Changed default to minimal
+active_theme_name = "minimal"
+active_theme_ns = THEMES_NS["minimal"]
 
 def set_theme(theme_name):
     """Set the active color theme."""
-    global active_theme
+    global active_theme, active_theme_name, active_theme_ns
     if theme_name in THEMES:
         active_theme = THEMES[theme_name]
+        active_theme_name = theme_name
+        active_theme_ns = THEMES_NS[theme_name]
 
 def get_theme_color(color_key, theme_name=None):
     """Get a color from the active theme or specified theme."""
@@ -111,6 +128,19 @@ def get_theme_color(color_key, theme_name=None):
         return THEMES[theme_name].get(color_key, "white")
     return active_theme.get(color_key, "white")
 
+# Shared Style per color and memoized gradient Texts: the animation loop
+# re-renders the same logo at 10 fps, so each (text, colors) pair is
+# styled once and reused instead of rebuilt character by character
+_STYLE_CACHE = {}
+_GRADIENT_CACHE = {}
+
+def _get_style(color):
+    """Return a shared Style for a color, creating it on first use."""
+    style = _STYLE_CACHE.get(color)
+    if style is None:
+        style = _STYLE_CACHE[color] = Style(color=color)
+    return style
+
 def create_gradient_text(text, colors=None):
     """Create text with gradient effect."""
     if colors is None:
@@ -119,63 +149,91 @@ def create_gradient_text(text, colors=None):
             get_theme_color("secondary"),
             get_theme_color("accent")
         ]
-    
+
+    cache_key = (text, tuple(colors))
+    styled_text = _GRADIENT_CACHE.get(cache_key)
+    if styled_text is not None:
+        return styled_text
+
     styled_text = Text()
-    
+    n_colors = len(colors)
+
     for line_idx, line in enumerate(text.split('\n')):
         # Adjust color rotation based on line index
         offset = line_idx % 3
-        
-        for char_idx, char in enumerate(line):
-            color_idx = (char_idx // 3 + offset) % len(colors)
-            styled_text.append(char, Style(color=colors[color_idx]))
-        
+
+        if n_colors == 1:
+            # Degenerate gradient: the whole line is one run
+            styled_text.append(line, _get_style(colors[0]))
+        else:
+            # The color changes every 3 characters, so append whole runs
+            # instead of one styled character at a time
+            for start in range(0, len(line), 3):
+                color_idx = (start // 3 + offset) % n_colors
+                styled_text.append(line[start:start + 3],
+                                   _get_style(colors[color_idx]))
+
         styled_text.append("\n")
-    
+
+    _GRADIENT_CACHE[cache_key] = styled_text
     return styled_text
 
+# Memoized like _GRADIENT_CACHE; the minimal-theme logo is re-styled
+# every frame otherwise
+_SIMPLE_CACHE = {}
+
 def create_simple_text(text, color=None):
     """Create text with simple styling (no gradient)."""
     if color is None:
         color = get_theme_color("primary")
-    
-    styled_text = Text()
-    styled_text.append(text, Style(color=color))
+
+    cache_key = (text, color)
+    styled_text = _SIMPLE_CACHE.get(cache_key)
+    if styled_text is None:
+        styled_text = Text()
+        styled_text.append(text, _get_style(color))
+        _SIMPLE_CACHE[cache_key] = styled_text
     return styled_text
 
 def create_matrix_effect(console, duration=2):
     """Create a Matrix-like effect for startup."""
+    import numpy as np
+
     width = console.width
     height = console.height
-    
-    chars = "01"
-    
+
     # Clear the screen
     console.clear()
-    
-    end_time = time.time() + duration
-    
-    while time.time() < end_time:
-        # Generate random characters
-        lines = []
-        for _ in range(height-1):
-            line = ''.join(random.choice(chars) for _ in range(width))
-            lines.append(line)
-        
-        # Display with color
-        for i, line in enumerate(lines):
-            brightness = 1.0 - (i / height)
-            if brightness > 0.8:
-                color = "bright_green"
-            elif brightness > 0.5:
-                color = "green"
-            else:
-                color = "dim green"
-            
-            console.print(line, style=color)
-        
-        time.sleep(0.1)
-        console.clear()
+
+    # Row colors are deterministic in the row index; compute them once
+    row_colors = []
+    for i in range(height - 1):
+        brightness = 1.0 - (i / height)
+        if brightness > 0.8:
+            row_colors.append("bright_green")
+        elif brightness > 0.5:
+            row_colors.append("green")
+        else:
+            row_colors.append("dim green")
+
+    # One vectorized draw per frame replaces height*width random.choice
+    # calls: index a two-byte alphabet with a random 0/1 matrix and carve
+    # the decoded buffer into rows
+    chars_arr = np.frombuffer(b"01", dtype=np.uint8)
+
+    def _frame() -> Text:
+        idx = np.random.randint(0, 2, size=(height - 1) * width)
+        buf = chars_arr[idx].tobytes().decode("ascii")
+        text = Text()
+        for i, color in enumerate(row_colors):
+            text.append(buf[i * width:(i + 1) * width] + "\n", style=color)
+        return text
+
+    # Live's refresh thread pulls fresh frames at its own capped rate -
+    # no manual sleep/clear ticking, no drift when a frame renders slow
+    with Live(console=console, refresh_per_second=10,
+              get_renderable=_frame, transient=True):
+        time.sleep(duration)
 
 class LogoAnimation:
     """Handles the animated display of the ResearchPal logo."""
@@ -187,98 +245,101 @@ class LogoAnimation:
         self.frame = 0
         self.max_frames = 20
         self.stop_event = threading.Event()
-    
-    def _render_frame(self):
-        """Render a frame of the animation."""
-        layout = Layout()
-        
-        # Use different logo based on theme
-        if active_theme == THEMES["minimal"] or active_theme == THEMES["professional"]:
-            logo_text = SIMPLE_LOGO
-            styled_logo = create_simple_text(logo_text, get_theme_color("primary"))
-        else:
-            # Use different logo based on frame for animated themes
-            if self.frame < self.max_frames // 2:
-                logo_text = HOLOGRAPHIC_LOGO
-            else:
-                logo_text = CYBER_LOGO
-            styled_logo = create_gradient_text(logo_text)
-        
-        # Create panels for icons - simplified for minimal theme
-        if active_theme == THEMES["minimal"] or active_theme == THEMES["professional"]:
-            icons = Text("PDF Processing | AI Analysis | Semantic Search", style=get_theme_color("secondary"))
-        else:
-            icons = Columns([
-                Panel(DOCUMENT_ICON, border_style=get_theme_color("primary")),
-                Panel(BRAIN_ICON, border_style=get_theme_color("secondary")),
-                Panel(SEARCH_ICON, border_style=get_theme_color("accent"))
-            ])
-        
-        # For simplified themes, just show the logo without much additional content
-        if active_theme in [THEMES["minimal"], THEMES["professional"]]:
-            # Just show the logo with minimal styling
-            layout.update(styled_logo)
-            return layout
-        
-        # Full fancy layout for other themes
-        layout.split(
-            Layout(name="logo", size=10),
-            Layout(name="content")
-        )
-        
-        layout["logo"].update(
+
+        # Everything except the frame-dependent content choice is static
+        # for the lifetime of the animation, so the panels are built once
+        # here instead of 10 times a second in _render_frame
+        self._minimal = active_theme_name in MINIMAL_THEMES
+        if self._minimal:
+            # The minimal frame never varies: it is just the styled logo
+            self._styled_logo = create_simple_text(
+                SIMPLE_LOGO, get_theme_color("primary")
+            )
+            return
+
+        title = f"[{get_theme_color('accent')}]ResearchPal[/{get_theme_color('accent')}]"
+        subtitle = f"[{get_theme_color('dim')}]v1.0.0[/{get_theme_color('dim')}]"
+        self._logo_panels = tuple(
             Panel(
-                styled_logo,
+                create_gradient_text(logo),
                 border_style=get_theme_color("primary"),
-                title=f"[{get_theme_color('accent')}]ResearchPal[/{get_theme_color('accent')}]",
-                subtitle=f"[{get_theme_color('dim')}]v1.0.0[/{get_theme_color('dim')}]"
+                title=title,
+                subtitle=subtitle
+            )
+            for logo in (HOLOGRAPHIC_LOGO, CYBER_LOGO)
+        )
+        self._tagline_panel = Panel(
+            Align.center(Text("Your AI-powered research paper assistant",
+                              style=get_theme_color("text"))),
+            border_style=get_theme_color("secondary")
+        )
+        self._tip_panels = tuple(
+            Panel(
+                Align.center(Text(tip, style=get_theme_color("text"))),
+                border_style=get_theme_color("secondary")
             )
+            for tip in random.sample(TIPS, len(TIPS))
+        )
+        # Cycling through a shuffled order replaces random.choice per
+        # tip frame with an O(1) next()
+        self._tip_iter = itertools.cycle(self._tip_panels)
+        self._icons_panel = Panel(
+            Columns([
+                Panel(DOCUMENT_ICON, border_style=get_theme_color("primary")),
+                Panel(BRAIN_ICON, border_style=get_theme_color("secondary")),
+                Panel(SEARCH_ICON, border_style=get_theme_color("accent"))
+            ]),
+            border_style=get_theme_color("secondary"),
+            title=f"[{get_theme_color('accent')}]Features[/{get_theme_color('accent')}]"
         )
-        
+
+    def _render_frame(self):
+        """Render a frame of the animation."""
+        # For simplified themes, just show the logo without much additional content
+        if self._minimal:
+            return self._styled_logo
+
+        # Use different logo based on frame for animated themes
+        logo_panel = self._logo_panels[
+            0 if self.frame < self.max_frames // 2 else 1
+        ]
+
         # Different content in different frames
         if self.frame % 3 == 0:
-            layout["content"].update(
-                Panel(
-                    Align.center(Text("Your AI-powered research paper assistant", style=get_theme_color("text"))),
-                    border_style=get_theme_color("secondary")
-                )
-            )
+            content_panel = self._tagline_panel
         elif self.frame % 3 == 1:
-            layout["content"].update(
-                Panel(
-                    Align.center(Text(random.choice(TIPS), style=get_theme_color("text"))),
-                    border_style=get_theme_color("secondary")
-                )
-            )
+            content_panel = next(self._tip_iter)
         else:
-            layout["content"].update(
-                Panel(
-                    icons,
-                    border_style=get_theme_color("secondary"),
-                    title=f"[{get_theme_color('accent')}]Features[/{get_theme_color('accent')}]"
-                )
-            )
-        
-        return layout
+            content_panel = self._icons_panel
+
+        # A flat Group of the two cached panels renders in one segment
+        # pass - no per-frame Layout tree to build and traverse
+        return Group(logo_panel, content_panel)
     
     def animate(self, duration=3.0):
         """Run the animation for a specified duration."""
         start_time = time.time()
         end_time = start_time + duration
-        
+
         # Clear screen
         self.console.clear()
-        
+
         # Optional matrix effect - disabled for minimal theme
-        if active_theme not in [THEMES["minimal"], THEMES["professional"]] and random.random() < 0.3:
+        if active_theme_name not in MINIMAL_THEMES and random.random() < 0.3:
             create_matrix_effect(self.console, duration=1.0)
-        
-        with Live(self._render_frame(), console=self.console, refresh_per_second=10) as live:
-            while time.time() < end_time and not self.stop_event.is_set():
-                self.frame = (self.frame + 1) % self.max_frames
-                live.update(self._render_frame())
-                time.sleep(0.1)
-        
+
+        def _next_frame():
+            # The frame index derives from elapsed time, so a slow render
+            # skips ahead instead of accumulating drift
+            self.frame = int((time.time() - start_time) * 10) % self.max_frames
+            return self._render_frame()
+
+        # Live's refresh thread drives rendering at its capped rate; the
+        # main thread just waits out the duration (or an early stop)
+        with Live(console=self.console, refresh_per_second=10,
+                  get_renderable=_next_frame):
+            self.stop_event.wait(max(0.0, end_time - time.time()))
+
         # Final frame
         self.console.print(self._render_frame())
     
@@ -286,6 +347,24 @@ class LogoAnimation:
         """Stop the animation."""
         self.stop_event.set()
 
+# Captured ANSI for the static minimal logo, keyed by theme and the
+# console traits that shape the output; replaying the blob skips rich's
+# Text -> Segment -> ANSI pipeline on repeat displays
+_LOGO_ANSI = {}
+
+def _print_simple_logo(console, theme_name):
+    """Write the static minimal logo, replaying captured ANSI when possible."""
+    key = (theme_name, console.color_system, console.width)
+    blob = _LOGO_ANSI.get(key)
+    if blob is None:
+        with console.capture() as capture:
+            console.print(create_simple_text(
+                SIMPLE_LOGO, get_theme_color("primary")
+            ))
+        blob = _LOGO_ANSI[key] = capture.get()
+    console.file.write(blob)
+    console.file.flush()
+
 def display_fancy_logo(console=None, animated=True, theme="minimal"):
     """Display the fancy logo, either animated or static."""
     if console is None:
@@ -294,15 +373,13 @@ def display_fancy_logo(console=None, animated=True, theme="minimal"):
     set_theme(theme)
     
     # For minimal theme, use a simpler display
-    if theme in ["minimal", "professional"]:
+    if theme in MINIMAL_THEMES:
         if animated:
             animation = LogoAnimation(console, theme)
             animation.animate(duration=1.0)  # Shorter duration for minimal theme
         else:
-            logo_text = SIMPLE_LOGO
-            styled_logo = create_simple_text(logo_text, get_theme_color("primary"))
-            console.print(styled_logo)
-            
+            _print_simple_logo(console, theme)
+
             # Just show a simple tip without panel
             tip = "Type 'help' for available commands."
             console.print(Text(tip, style=get_theme_color("secondary")))
@@ -332,12 +409,10 @@ def get_fancy_prompt(theme_name=None):
     if theme_name:
         set_theme(theme_name)
     
-    primary = get_theme_color("primary")
-    secondary = get_theme_color("secondary")
-    text = get_theme_color("text")
-    
+    ns = active_theme_ns
+
     # Simpler prompt for minimal themes
-    if active_theme in [THEMES["minimal"], THEMES["professional"]]:
-        return f"[{primary}]rpal[/{primary}] [{secondary}]>[/{secondary}] "
+    if active_theme_name in MINIMAL_THEMES:
+        return f"[{ns.primary}]rpal[/{ns.primary}] [{ns.secondary}]>[/{ns.secondary}] "
     else:
-        return f"[{primary}]research[/{primary}][{text}]pal[/{text}] [{secondary}]>[/{secondary}] "
\ No newline at end of file
+        return f"[{ns.primary}]research[/{ns.primary}][{ns.text}]pal[/{ns.text}] [{ns.secondary}]>[/{ns.secondary}] "
\ No newline at end of file
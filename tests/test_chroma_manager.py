@@ -2,6 +2,7 @@
 Tests for the ChromaDB manager module.
 """
 import os
+import json
 import pytest
 import tempfile
 import shutil
@@ -68,12 +69,13 @@ def test_add_paper(chroma_manager):
     assert metadata["filepath"] == "/path/to/test.pdf"
     assert metadata["domain"] == "Computer Science"
     assert metadata["has_architecture"] is True
-    
-    # Check that document text contains expected content
+    assert metadata["architecture"] == "Test architecture"
+    assert json.loads(metadata["takeaways"]) == ["Takeaway 1", "Takeaway 2"]
+
+    # Check that the embedded document text contains the semantic content
     document_text = kwargs["documents"][0]
     assert "This is a test summary" in document_text
     assert "Takeaway 1 | Takeaway 2" in document_text
-    assert "Test architecture" in document_text
 
 
 def test_get_paper(chroma_manager):
@@ -81,15 +83,23 @@ def test_get_paper(chroma_manager):
     # Mock the collection response
     chroma_manager.papers_collection.get.return_value = {
         "ids": ["test123"],
-        "documents": ["summary: This is a test summary\ntakeaways: Takeaway 1 | Takeaway 2\ndomain: Computer Science"],
-        "metadatas": [{"title": "Test Paper", "filepath": "/path/to/test.pdf", "domain": "Computer Science"}]
+        "documents": ["Test Paper\nThis is a test summary\nTakeaway 1 | Takeaway 2"],
+        "metadatas": [{
+            "title": "Test Paper",
+            "filepath": "/path/to/test.pdf",
+            "domain": "Computer Science",
+            "summary": "This is a test summary",
+            "takeaways": '["Takeaway 1", "Takeaway 2"]'
+        }]
     }
     
     # Call the method
     result = chroma_manager.get_paper("test123")
     
     # Verify the collection call
-    chroma_manager.papers_collection.get.assert_called_once_with(ids=["test123"])
+    chroma_manager.papers_collection.get.assert_called_once_with(
+        ids=["test123"], include=["metadatas"]
+    )
     
     # Check the result
     assert result is not None
@@ -115,7 +125,9 @@ def test_get_paper_not_found(chroma_manager):
     result = chroma_manager.get_paper("nonexistent")
     
     # Verify the collection call
-    chroma_manager.papers_collection.get.assert_called_once_with(ids=["nonexistent"])
+    chroma_manager.papers_collection.get.assert_called_once_with(
+        ids=["nonexistent"], include=["metadatas"]
+    )
     
     # Check the result
     assert result is None
@@ -126,34 +138,30 @@ def test_search_papers(chroma_manager):
     # Mock the collection response
     chroma_manager.papers_collection.query.return_value = {
         "ids": [["test123", "test456"]],
-        "distances": [[0.1, 0.2]]
+        "distances": [[0.1, 0.2]],
+        "metadatas": [[
+            {"title": "Test Paper", "takeaways": '["Takeaway 1"]'},
+            {"title": "Another Test", "takeaways": "[]"}
+        ]]
     }
-    
-    # Mock the get_paper method
-    with patch.object(chroma_manager, "get_paper") as mock_get_paper:
-        mock_get_paper.side_effect = [
-            {"paper_id": "test123", "title": "Test Paper"},
-            {"paper_id": "test456", "title": "Another Test"}
-        ]
-        
-        # Call the method
-        results = chroma_manager.search_papers("test query", n_results=2)
-        
-        # Verify the collection call
-        chroma_manager.papers_collection.query.assert_called_once_with(
-            query_texts=["test query"],
-            n_results=2
-        )
-        
-        # Verify get_paper calls
-        assert mock_get_paper.call_count == 2
-        mock_get_paper.assert_any_call("test123")
-        mock_get_paper.assert_any_call("test456")
-        
-        # Check the results
-        assert len(results) == 2
-        assert results[0]["paper_id"] == "test123"
-        assert results[1]["paper_id"] == "test456"
+
+    # Call the method
+    results = chroma_manager.search_papers("test query", n_results=2)
+
+    # Verify the single collection call (no per-id re-fetch)
+    chroma_manager.papers_collection.query.assert_called_once_with(
+        query_texts=["test query"],
+        n_results=2,
+        include=["metadatas"]
+    )
+    chroma_manager.papers_collection.get.assert_not_called()
+
+    # Check the results
+    assert len(results) == 2
+    assert results[0]["paper_id"] == "test123"
+    assert results[0]["title"] == "Test Paper"
+    assert results[0]["takeaways"] == ["Takeaway 1"]
+    assert results[1]["paper_id"] == "test456"
 
 
 def test_search_by_domain(chroma_manager):
@@ -162,34 +170,27 @@ def test_search_by_domain(chroma_manager):
     chroma_manager.papers_collection.get.return_value = {
         "ids": ["test123", "test789"],
         "documents": ["doc1", "doc2"],
-        "metadatas": [{"domain": "Computer Science"}, {"domain": "Computer Science"}]
-    }
-    
-    # Mock the get_paper method
-    with patch.object(chroma_manager, "get_paper") as mock_get_paper:
-        mock_get_paper.side_effect = [
-            {"paper_id": "test123", "title": "Test CS Paper", "domain": "Computer Science"},
-            {"paper_id": "test789", "title": "Another CS Paper", "domain": "Computer Science"}
+        "metadatas": [
+            {"title": "Test CS Paper", "domain": "Computer Science"},
+            {"title": "Another CS Paper", "domain": "Computer Science"}
         ]
-        
-        # Call the method
-        results = chroma_manager.search_by_domain("Computer Science", n_results=2)
-        
-        # Verify the collection call
-        chroma_manager.papers_collection.get.assert_called_once_with(
-            where={"domain": {"$eq": "Computer Science"}}
-        )
-        
-        # Verify get_paper calls
-        assert mock_get_paper.call_count == 2
-        mock_get_paper.assert_any_call("test123")
-        mock_get_paper.assert_any_call("test789")
-        
-        # Check the results
-        assert len(results) == 2
-        assert results[0]["paper_id"] == "test123"
-        assert results[1]["paper_id"] == "test789"
-        assert results[0]["domain"] == "Computer Science"
+    }
+
+    # Call the method
+    results = chroma_manager.search_by_domain("Computer Science", n_results=2)
+
+    # Verify the collection call
+    chroma_manager.papers_collection.get.assert_called_once_with(
+        where={"domain": {"$eq": "Computer Science"}},
+        limit=2,
+        include=["metadatas"]
+    )
+
+    # Check the results
+    assert len(results) == 2
+    assert results[0]["paper_id"] == "test123"
+    assert results[1]["paper_id"] == "test789"
+    assert results[0]["domain"] == "Computer Science"
 
 
 def test_update_paper_field(chroma_manager):
@@ -3,27 +3,38 @@ Tests for the configuration utilities.
 """
 import os
 import pytest
-import tempfile
 import yaml
 from unittest.mock import patch, MagicMock
 
+# Prefer the libyaml-backed loader/dumper when available, matching the
+# fast path used by research_pal.utils.config
+try:
+    from yaml import CSafeLoader
+except ImportError:
+    from yaml import SafeLoader as CSafeLoader
+try:
+    from yaml import CSafeDumper
+except ImportError:
+    from yaml import SafeDumper as CSafeDumper
+
 from research_pal.utils.config import load_config, save_config, get_api_key, DEFAULT_CONFIG
 
+# Default keys not overridden by the test config written in
+# test_load_config_existing, computed once at module scope
+_MISSING_DEFAULT_KEYS = frozenset(DEFAULT_CONFIG) - {
+    "openai_api_key", "default_model", "db_path"
+}
+
 
 @pytest.fixture
-def temp_config_file():
-    """Create a temporary config file."""
-    with tempfile.NamedTemporaryFile(suffix='.yaml', delete=False) as f:
-        yield f.name
-    # Clean up after the test
-    os.unlink(f.name)
+def temp_config_file(tmp_path):
+    """Path for a per-test config file (pytest cleans the directory up)."""
+    return str(tmp_path / "config.yaml")
 
 
 def test_load_config_default(temp_config_file):
     """Test loading default configuration."""
     # Test loading when file doesn't exist
-    os.unlink(temp_config_file)  # Delete the file
-    
     config = load_config(temp_config_file)
     
     # Verify that we get default config
@@ -44,7 +55,7 @@ def test_load_config_existing(temp_config_file):
     
     # Write the config to file
     with open(temp_config_file, 'w') as f:
-        yaml.dump(test_config, f)
+        yaml.dump(test_config, f, Dumper=CSafeDumper)
     
     # Load the config
     config = load_config(temp_config_file)
@@ -55,10 +66,9 @@ def test_load_config_existing(temp_config_file):
     assert "~/test_db" in config["db_path"]  # Path should be expanded
     
     # Missing values should be filled with defaults
-    for key in DEFAULT_CONFIG:
-        if key not in test_config:
-            assert key in config
-            assert config[key] == DEFAULT_CONFIG[key]
+    for key in _MISSING_DEFAULT_KEYS:
+        assert key in config
+        assert config[key] == DEFAULT_CONFIG[key]
 
 
 def test_save_config(temp_config_file):
@@ -77,40 +87,43 @@ def test_save_config(temp_config_file):
     
     # Load the config and verify contents
     with open(temp_config_file, 'r') as f:
-        loaded_config = yaml.safe_load(f)
+        loaded_config = yaml.load(f, Loader=CSafeLoader)
     
     assert loaded_config["openai_api_key"] == "test_key"
     assert loaded_config["default_model"] == "test_model"
 
 
-def test_get_api_key_from_env():
+def test_get_api_key_from_env(monkeypatch):
     """Test getting API key from environment."""
     # Set environment variable
-    with patch.dict(os.environ, {"OPENAI_API_KEY": "env_key"}):
-        key = get_api_key("openai")
-        assert key == "env_key"
+    monkeypatch.setenv("OPENAI_API_KEY", "env_key")
+
+    key = get_api_key("openai")
+    assert key == "env_key"
 
 
-def test_get_api_key_from_config():
+def test_get_api_key_from_config(monkeypatch):
     """Test getting API key from config when not in environment."""
     # Mock load_config
     with patch("research_pal.utils.config.load_config") as mock_load_config:
         mock_load_config.return_value = {"openai_api_key": "config_key"}
-        
+
         # Ensure no environment variable
-        with patch.dict(os.environ, {}, clear=True):
-            key = get_api_key("openai")
-            assert key == "config_key"
-            mock_load_config.assert_called_once()
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+
+        key = get_api_key("openai")
+        assert key == "config_key"
+        mock_load_config.assert_called_once()
 
 
-def test_get_api_key_not_found():
+def test_get_api_key_not_found(monkeypatch):
     """Test behavior when API key is not found."""
     # Mock load_config to return empty config
     with patch("research_pal.utils.config.load_config") as mock_load_config:
         mock_load_config.return_value = {}
-        
+
         # Ensure no environment variable
-        with patch.dict(os.environ, {}, clear=True):
-            key = get_api_key("nonexistent")
-            assert key is None
\ No newline at end of file
+        monkeypatch.delenv("NONEXISTENT_API_KEY", raising=False)
+
+        key = get_api_key("nonexistent")
+        assert key is None
\ No newline at end of file
@@ -4,18 +4,24 @@ Tests for the LLM interface module.
 import os
 import pytest
 import json
-from unittest.mock import patch, MagicMock, AsyncMock
+from unittest.mock import MagicMock, AsyncMock
 
 from research_pal.core.llm_interface import LLMInterface
 
 
-@pytest.fixture
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    """Make asyncio.sleep return immediately so retry/backoff paths don't idle."""
+    monkeypatch.setattr("asyncio.sleep", AsyncMock())
+
+
+@pytest.fixture(scope="module")
 def llm_interface():
-    """Create an LLM interface for testing."""
+    """Create an LLM interface shared by all tests in this module."""
     # Set mock API keys for testing
     os.environ["OPENAI_API_KEY"] = "test_openai_key"
     os.environ["GOOGLE_API_KEY"] = "test_google_key"
-    
+
     return LLMInterface(default_model="gpt-4o-mini")
 
 
@@ -40,118 +46,148 @@ def test_get_model_info(llm_interface):
     assert default_model_info == model_info
 
 
-def test_select_provider(llm_interface):
-    """Test provider selection based on model."""
-    assert llm_interface._select_provider("gpt-4o-mini") == "openai"
-    assert llm_interface._select_provider("gemini-1.5-flash") == "google"
-    
-    # Test default provider
-    assert llm_interface._select_provider() == "openai"  # Based on default_model
+@pytest.mark.parametrize("model,provider,actual", [
+    ("gpt-4o-mini", "openai", "gpt-4o-mini"),
+    # Google models map to the model_name the API expects
+    ("gemini-1.5-flash", "google", "gemini-1.5-flash-latest"),
+])
+def test_provider_routing(llm_interface, model, provider, actual):
+    """Test provider selection and actual model name per model."""
+    assert llm_interface._select_provider(model) == provider
+    assert llm_interface._get_actual_model_name(model) == actual
 
 
-def test_get_actual_model_name(llm_interface):
-    """Test getting actual model name for API requests."""
-    assert llm_interface._get_actual_model_name("gpt-4o-mini") == "gpt-4o-mini"
-    
-    # For Google models, should return the mapping from model_name
-    assert llm_interface._get_actual_model_name("gemini-1.5-flash") == "gemini-1.5-flash-latest"
+def test_select_provider_default(llm_interface):
+    """Test default provider selection based on default_model."""
+    assert llm_interface._select_provider() == "openai"
+
+
+# Canned API responses keyed by URL substring; one fake post installed at
+# module scope dispatches on the request URL instead of each test opening
+# its own patch() context
+_ROUTES = (
+    ("generativelanguage.googleapis.com", json.dumps({
+        "candidates": [
+            {
+                "content": {
+                    "parts": [{"text": "Test response"}]
+                }
+            }
+        ]
+    }).encode()),
+    ("", json.dumps({
+        "choices": [{"message": {"content": "Test response"}}]
+    }).encode()),
+)
+
+# (url, kwargs) for every request the fake post has served
+_POST_CALLS = []
+
+
+async def _fake_post(self, url, **kwargs):
+    _POST_CALLS.append((url, kwargs))
+    for url_key, content in _ROUTES:
+        if url_key in url:
+            resp = MagicMock()
+            resp.raise_for_status = MagicMock()
+            resp.content = content
+            return resp
+
+
+@pytest.fixture(autouse=True, scope="module")
+def http_post_stub():
+    """Install the URL-dispatching fake httpx post once for this module."""
+    mp = pytest.MonkeyPatch()
+    mp.setattr("httpx.AsyncClient.post", _fake_post)
+    yield
+    mp.undo()
+
+
+@pytest.fixture(autouse=True)
+def _clear_post_calls():
+    """Start each test with an empty request capture list."""
+    _POST_CALLS.clear()
 
 
 @pytest.mark.asyncio
 async def test_query_openai(llm_interface):
     """Test OpenAI API query."""
-    with patch("httpx.AsyncClient.post") as mock_post:
-        # Mock response
-        mock_response = MagicMock()
-        mock_response.raise_for_status = MagicMock()
-        mock_response.json.return_value = {
-            "choices": [{"message": {"content": "Test response"}}]
-        }
-        mock_post.return_value = mock_response
-        
-        # Call the method
-        response = await llm_interface.query_openai(
-            prompt="Test prompt",
-            system_message="Test system message"
-        )
-        
-        # Verify response
-        assert response == "Test response"
-        
-        # Verify API call
-        mock_post.assert_called_once()
-        args, kwargs = mock_post.call_args
-        assert kwargs["json"]["messages"][0]["role"] == "system"
-        assert kwargs["json"]["messages"][0]["content"] == "Test system message"
-        assert kwargs["json"]["messages"][1]["role"] == "user"
-        assert kwargs["json"]["messages"][1]["content"] == "Test prompt"
+    response = await llm_interface.query_openai(
+        prompt="Test prompt",
+        system_message="Test system message"
+    )
+
+    # Verify response
+    assert response == "Test response"
+
+    # Verify API call
+    assert len(_POST_CALLS) == 1
+    url, kwargs = _POST_CALLS[0]
+    body = json.loads(kwargs["content"])
+    assert body["messages"][0]["role"] == "system"
+    assert body["messages"][0]["content"] == "Test system message"
+    assert body["messages"][1]["role"] == "user"
+    assert body["messages"][1]["content"] == "Test prompt"
 
 
 @pytest.mark.asyncio
 async def test_query_google(llm_interface):
     """Test Google API query."""
-    with patch("httpx.AsyncClient.post") as mock_post:
-        # Mock response
-        mock_response = MagicMock()
-        mock_response.raise_for_status = MagicMock()
-        mock_response.json.return_value = {
-            "candidates": [
-                {
-                    "content": {
-                        "parts": [{"text": "Test response"}]
-                    }
-                }
-            ]
-        }
-        mock_post.return_value = mock_response
-        
-        # Call the method
-        response = await llm_interface.query_google(
-            prompt="Test prompt",
-            system_message="Test system message",
-            model="gemini-1.5-flash"
-        )
-        
-        # Verify response
-        assert response == "Test response"
-        
-        # Verify API call
-        mock_post.assert_called_once()
-        args, kwargs = mock_post.call_args
-        assert "generativelanguage.googleapis.com" in args[0]
-        assert "gemini-1.5-flash-latest" in args[0]
-        assert kwargs["json"]["contents"][0]["parts"][0]["text"].startswith("<system>")
-        assert kwargs["json"]["contents"][1]["parts"][0]["text"] == "Test prompt"
+    response = await llm_interface.query_google(
+        prompt="Test prompt",
+        system_message="Test system message",
+        model="gemini-1.5-flash"
+    )
+
+    # Verify response
+    assert response == "Test response"
+
+    # Verify API call
+    assert len(_POST_CALLS) == 1
+    url, kwargs = _POST_CALLS[0]
+    assert "generativelanguage.googleapis.com" in url
+    assert "gemini-1.5-flash-latest" in url
+    body = json.loads(kwargs["content"])
+    assert body["systemInstruction"]["parts"][0]["text"] == "Test system message"
+    assert body["contents"][0]["parts"][0]["text"] == "Test prompt"
+
+
+class _AsyncStub:
+    """Awaitable stub that records calls without AsyncMock's setup cost."""
+
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+        self.last = None
+
+    async def __call__(self, *args, **kwargs):
+        self.calls += 1
+        self.last = (args, kwargs)
+        return self.value
 
 
 @pytest.mark.asyncio
-async def test_query_model(llm_interface):
+async def test_query_model(llm_interface, monkeypatch):
     """Test generic model query routing."""
-    with patch.object(llm_interface, "query_openai", new_callable=AsyncMock) as mock_openai, \
-         patch.object(llm_interface, "query_google", new_callable=AsyncMock) as mock_google:
-        
-        # Mock responses
-        mock_openai.return_value = "OpenAI response"
-        mock_google.return_value = "Google response"
-        
-        # Test OpenAI routing
-        response_openai = await llm_interface.query_model(
-            prompt="Test prompt",
-            model="gpt-4o-mini"
-        )
-        assert response_openai == "OpenAI response"
-        mock_openai.assert_called_once()
-        mock_google.assert_not_called()
-        
-        # Reset mocks
-        mock_openai.reset_mock()
-        mock_google.reset_mock()
-        
-        # Test Google routing
-        response_google = await llm_interface.query_model(
-            prompt="Test prompt",
-            model="gemini-1.5-flash"
-        )
-        assert response_google == "Google response"
-        mock_google.assert_called_once()
-        mock_openai.assert_not_called()
\ No newline at end of file
+    stub_openai = _AsyncStub("OpenAI response")
+    stub_google = _AsyncStub("Google response")
+    monkeypatch.setattr(llm_interface, "query_openai", stub_openai)
+    monkeypatch.setattr(llm_interface, "query_google", stub_google)
+
+    # Test OpenAI routing
+    response_openai = await llm_interface.query_model(
+        prompt="Test prompt",
+        model="gpt-4o-mini"
+    )
+    assert response_openai == "OpenAI response"
+    assert stub_openai.calls == 1
+    assert stub_google.calls == 0
+
+    # Test Google routing
+    response_google = await llm_interface.query_model(
+        prompt="Test prompt",
+        model="gemini-1.5-flash"
+    )
+    assert response_google == "Google response"
+    assert stub_google.calls == 1
+    assert stub_openai.calls == 1
\ No newline at end of file
@@ -8,9 +8,26 @@ from unittest.mock import patch, MagicMock
 from research_pal.core.pdf_processor import PDFProcessor
 
 
-@pytest.fixture
+# Sample text with paragraph breaks, sized to exceed one chunk; built once
+# at module scope so reruns don't rebuild it
+_SAMPLE_TEXT = "This is paragraph one.\n\nThis is paragraph two.\n\nThis is paragraph three with more text to ensure that it exceeds the chunk size. " + "Extra text " * 100
+
+# Shared fake extraction output for the monkeypatched pdfminer calls
+FAKE_TEXT = """
+    Title: Test Research Paper
+    Authors: John Doe, Jane Smith
+
+    Abstract
+    This is a test abstract for a research paper about testing.
+
+    Introduction
+    This paper introduces testing methodology.
+    """
+
+
+@pytest.fixture(scope="module")
 def pdf_processor():
-    """Create a PDF processor for testing."""
+    """Create a PDF processor shared by all tests in this module."""
     return PDFProcessor(chunk_size=1000, chunk_overlap=100)
 
 
@@ -22,10 +39,7 @@ def test_init(pdf_processor):
 
 def test_chunk_text(pdf_processor):
     """Test chunking of text."""
-    # Create sample text with paragraph breaks
-    sample_text = "This is paragraph one.\n\nThis is paragraph two.\n\nThis is paragraph three with more text to ensure that it exceeds the chunk size. " + "Extra text " * 100
-    
-    chunks = pdf_processor._chunk_text(sample_text)
+    chunks = pdf_processor._chunk_text(_SAMPLE_TEXT)
     
     # Verify chunks
     assert len(chunks) > 1  # Should create multiple chunks
@@ -36,24 +50,15 @@ def test_chunk_text(pdf_processor):
     assert "paragraph three" in chunks[1]  # Second chunk should include third paragraph
 
 
-@patch("pdfminer.high_level.extract_text")
-def test_extract_metadata(mock_extract_text, pdf_processor):
+def test_extract_metadata(monkeypatch, pdf_processor):
     """Test metadata extraction from PDF."""
-    # Mock extract_text function
-    mock_extract_text.return_value = """
-    Title: Test Research Paper
-    Authors: John Doe, Jane Smith
-    
-    Abstract
-    This is a test abstract for a research paper about testing.
-    
-    Introduction
-    This paper introduces testing methodology.
-    """
-    
+    # Swap extract_text for a cheap callable instead of a MagicMock
+    monkeypatch.setattr("pdfminer.high_level.extract_text",
+                        lambda *a, **k: FAKE_TEXT)
+
     metadata = pdf_processor._extract_metadata(
         filepath="test.pdf",
-        text=mock_extract_text.return_value
+        text=FAKE_TEXT
     )
     
     # Verify metadata extraction
@@ -63,26 +68,14 @@ def test_extract_metadata(mock_extract_text, pdf_processor):
     assert "abstract" in metadata  # Should extract abstract
 
 
-@patch("research_pal.core.pdf_processor.extract_text")
-@patch("research_pal.core.pdf_processor.extract_pages")
-def test_extract_and_chunk(mock_extract_pages, mock_extract_text, pdf_processor):
+def test_extract_and_chunk(monkeypatch, pdf_processor):
     """Test PDF extraction and chunking."""
-    # Mock extract_text function
-    mock_extract_text.return_value = """
-    Title: Test Research Paper
-    Authors: John Doe, Jane Smith
-    
-    Abstract
-    This is a test abstract for a research paper about testing.
-    
-    Introduction
-    This paper introduces testing methodology.
-    """
-    
-    # Mock extract_pages function
-    mock_page_layout = MagicMock()
-    mock_extract_pages.return_value = [mock_page_layout]
-    
+    # Swap the pdfminer entry points for cheap callables
+    monkeypatch.setattr("research_pal.core.pdf_processor.extract_text",
+                        lambda *a, **k: FAKE_TEXT)
+    monkeypatch.setattr("research_pal.core.pdf_processor.extract_pages",
+                        lambda *a, **k: [MagicMock()])
+
     # Call the method
     result = pdf_processor.extract_and_chunk("test.pdf")
     